@@ -25,6 +25,7 @@ class Config:
     # Common Translation Settings
     TRANSLATION_TEMPERATURE = float(os.getenv("TRANSLATION_TEMPERATURE", "0.3"))
     MAX_TOKENS = int(os.getenv("MAX_TOKENS", "2000"))
+    MAX_PARALLEL_REQUESTS = int(os.getenv("MAX_PARALLEL_REQUESTS", "5"))  # Raise for higher API rate-limit tiers
 
     # Flask Configuration
     FLASK_ENV = os.getenv("FLASK_ENV", "development")
@@ -34,10 +35,12 @@ class Config:
     BASE_DIR = Path(__file__).parent.parent
     UPLOAD_FOLDER = BASE_DIR / "tmp" / "uploads"
     OUTPUT_FOLDER = BASE_DIR / "tmp" / "outputs"
+    CACHE_FOLDER = BASE_DIR / "tmp" / "cache"
 
     # Ensure directories exist
     UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
     OUTPUT_FOLDER.mkdir(parents=True, exist_ok=True)
+    CACHE_FOLDER.mkdir(parents=True, exist_ok=True)
 
     # Logging
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -136,7 +136,7 @@ def _detect_collisions_on_slide(chart_groups, non_chart_groups):
 
                 collisions.append(collision_info)
 
-                logger.debug(f"    Collision: {chart_group['name']} vs {other_group['name']} (overlap: {overlap_width/914400:.2f}\")")
+                logger.debug("    Collision: %s vs %s (overlap: %.2f\")", chart_group['name'], other_group['name'], overlap_width/914400)
 
     return collisions
 
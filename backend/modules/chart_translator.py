@@ -5,9 +5,8 @@ Translates text within PowerPoint charts while keeping chart positions unchanged
 import os
 import sys
 import zipfile
-import shutil
 from lxml import etree
-from typing import Dict, List, Any
+from typing import Any, BinaryIO, Dict, List, Optional, Union
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -23,72 +22,83 @@ CHART_NS = {
     'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
 }
 
-def translate_charts_in_pptx(input_path: str, output_path: str, source_lang: str = "English", target_lang: str = "Arabic"):
+def translate_charts_in_pptx(input_path: Union[str, BinaryIO], output_path: Union[str, BinaryIO],
+                             source_lang: str = "English", target_lang: str = "Arabic",
+                             compression: int = zipfile.ZIP_DEFLATED):
     """
     Translate all charts in a PowerPoint presentation
-    
+
+    The package is rewritten entry by entry in memory - only the chart parts
+    are changed, everything else is copied through - so both ends can be
+    file paths or binary streams (e.g. io.BytesIO between pipeline stages).
+
     Args:
-        input_path: Path to input PPTX file
-        output_path: Path to output PPTX file
+        input_path: Path to input PPTX file (or binary stream)
+        output_path: Path to output PPTX file (or binary stream)
         source_lang: Source language (default: English)
         target_lang: Target language (default: Arabic)
+        compression: Zip compression of the output - ZIP_STORED skips deflate
+            for intermediate packages that are read back straight away
+    """
+    source_name = input_path if isinstance(input_path, str) else "in-memory presentation"
+    logger.info(f"Translating charts in: {source_name}")
+
+    with zipfile.ZipFile(input_path, 'r') as zip_in, \
+         zipfile.ZipFile(output_path, 'w', compression) as zip_out:
+        # Find all chart XML files
+        chart_files = [name for name in zip_in.namelist() if _is_chart_part(name)]
+        if chart_files:
+            logger.info(f"Found {len(chart_files)} chart file(s)")
+        else:
+            logger.info("No charts found in presentation")
+
+        for item in zip_in.infolist():
+            data = zip_in.read(item.filename)
+
+            # Translate each chart
+            if _is_chart_part(item.filename):
+                translated = _translate_chart_xml(data, os.path.basename(item.filename),
+                                                  source_lang, target_lang)
+                if translated is not None:
+                    data = translated
+
+            zip_out.writestr(item.filename, data)
+
+    logger.info("Chart translation complete")
+
+def _is_chart_part(name: str) -> bool:
+    """True for chart parts (ppt/charts/chartN.xml), not their rels, styles or colors"""
+    folder, _, file_name = name.rpartition('/')
+    return folder == 'ppt/charts' and file_name.startswith('chart') and file_name.endswith('.xml')
+
+def _translate_chart_xml(xml_bytes: bytes, chart_name: str, source_lang: str, target_lang: str) -> Optional[bytes]:
+    """
+    Translate text in a single chart XML part
+
+    Returns:
+        Updated XML bytes, or None when the chart has no text to translate
     """
-    logger.info(f"Translating charts in: {input_path}")
-    
-    # Extract PPTX to temp directory
-    temp_dir = input_path.replace('.pptx', '_chart_temp')
-    if os.path.exists(temp_dir):
-        shutil.rmtree(temp_dir)
-    
-    with zipfile.ZipFile(input_path, 'r') as zip_ref:
-        zip_ref.extractall(temp_dir)
-    
-    # Find all chart XML files
-    charts_dir = os.path.join(temp_dir, 'ppt', 'charts')
-    if not os.path.exists(charts_dir):
-        logger.info("No charts found in presentation")
-        _repack_pptx(temp_dir, output_path)
-        shutil.rmtree(temp_dir)
-        return
-    
-    chart_files = [f for f in os.listdir(charts_dir) if f.startswith('chart') and f.endswith('.xml')]
-    logger.info(f"Found {len(chart_files)} chart file(s)")
-    
-    # Translate each chart
-    for chart_file in chart_files:
-        chart_path = os.path.join(charts_dir, chart_file)
-        _translate_chart_file(chart_path, source_lang, target_lang)
-    
-    # Repack PPTX
-    _repack_pptx(temp_dir, output_path)
-    shutil.rmtree(temp_dir)
-    
-    logger.info(f"Chart translation complete: {output_path}")
-
-def _translate_chart_file(chart_path: str, source_lang: str, target_lang: str):
-    """Translate text in a single chart XML file"""
-    logger.info(f"Translating chart: {os.path.basename(chart_path)}")
-    
+    logger.info(f"Translating chart: {chart_name}")
+
     # Parse XML
-    tree = etree.parse(chart_path)
-    root = tree.getroot()
-    
+    root = etree.fromstring(xml_bytes)
+
     # Extract all text elements
     texts_to_translate = []
     text_elements = []
-    
+
     # Find all <a:t> elements (text runs)
     for t_elem in root.findall('.//a:t', CHART_NS):
         if t_elem.text and t_elem.text.strip():
             texts_to_translate.append(t_elem.text.strip())
             text_elements.append(t_elem)
-    
+
     if not texts_to_translate:
         logger.info(f"  No text found in chart")
-        return
-    
+        return None
+
     logger.info(f"  Found {len(texts_to_translate)} text element(s) to translate")
-    
+
     # Translate all texts using LLM
     # Create a simple structure for translation
     structure = {
@@ -97,11 +107,11 @@ def _translate_chart_file(chart_path: str, source_lang: str, target_lang: str):
             for i, text in enumerate(texts_to_translate)
         ]
     }
-    
+
     context = {}  # No context needed for chart translation
-    
+
     translations = translate_with_openai(structure, context, source_lang, target_lang)
-    
+
     # Replace text in XML
     for i, t_elem in enumerate(text_elements):
         element_id = f"text_{i}"
@@ -109,19 +119,10 @@ def _translate_chart_file(chart_path: str, source_lang: str, target_lang: str):
             translated_text = translations[element_id]
             logger.info(f"  '{t_elem.text.strip()[:30]}' -> '{translated_text[:30]}'")
             t_elem.text = translated_text
-    
-    # Save updated XML
-    tree.write(chart_path, encoding='utf-8', xml_declaration=True, standalone=True)
-    logger.info(f"  Updated chart XML")
 
-def _repack_pptx(temp_dir: str, output_path: str):
-    """Repack extracted PPTX directory into .pptx file"""
-    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(temp_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, temp_dir)
-                zipf.write(file_path, arcname)
+    # Serialize updated XML
+    logger.info(f"  Updated chart XML")
+    return etree.tostring(root.getroottree(), encoding='utf-8', xml_declaration=True, standalone=True)
 
 if __name__ == "__main__":
     if len(sys.argv) > 2:
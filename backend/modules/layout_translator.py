@@ -3,11 +3,10 @@ Layout Translator Module
 Translates text in slide layouts (background/template text)
 """
 import zipfile
-import tempfile
 import shutil
 import os
 import re
-from typing import Dict, List
+from typing import BinaryIO, Dict, List, Optional, Union
 import sys
 
 # Add parent directory to path
@@ -15,10 +14,18 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import Config
 from utils.logger import setup_logger
-from modules.llm_translator import _translate_single_text
+from modules.llm_translator import (
+    _translate_single_text,
+    _translation_cache_key,
+    _load_cached_translations,
+    _store_cached_translations
+)
 
 logger = setup_logger(__name__)
 
+# Layout text with any Arabic letter (U+0600-U+06FF) is already translated
+_ARABIC_RE = re.compile('[\u0600-\u06FF]').search
+
 def _batch_translate_layout_texts(
     texts: List[str],
     source_lang: str,
@@ -88,68 +95,131 @@ Preserve the order. Return ONLY the JSON, no additional text."""
         # Fallback: return originals
         return texts
 
-def translate_slide_layouts(pptx_path: str, output_path: str) -> None:
+def _translate_layout_texts_cached(
+    texts: List[str],
+    source_lang: str,
+    target_lang: str
+) -> List[str]:
+    """
+    Translate layout texts through the shared translation cache
+
+    Layouts are the same from run to run (and across decks built on the same
+    template), so texts translated before are answered from the cache and
+    only the rest - each distinct text once - goes to the batch API call.
+
+    Returns:
+        List of translated strings in same order
+    """
+    cache_keys = [
+        _translation_cache_key({"type": "layout", "text": text}, source_lang, target_lang)
+        for text in texts
+    ]
+    cached = _load_cached_translations(set(cache_keys))
+
+    misses = list(dict.fromkeys(
+        text for text, cache_key in zip(texts, cache_keys) if cache_key not in cached
+    ))
+    if len(misses) < len(texts):
+        logger.info(f"  {len(texts) - len(misses)} layout text(s) served from the translation cache")
+
+    fresh = {}
+    if misses:
+        for text, translated in zip(misses, _batch_translate_layout_texts(misses, source_lang, target_lang)):
+            cache_key = _translation_cache_key({"type": "layout", "text": text}, source_lang, target_lang)
+            cached[cache_key] = translated
+            # The batch call falls back to the original text on failure - don't keep that
+            if translated and translated != text:
+                fresh[cache_key] = translated
+        _store_cached_translations(fresh)
+
+    return [cached.get(cache_key, text) for text, cache_key in zip(texts, cache_keys)]
+
+def translate_slide_layouts(pptx_path: Union[str, BinaryIO], output_path: Union[str, BinaryIO]) -> None:
     """
     Translate text in slide layouts (background graphics)
 
+    The package is rewritten entry by entry in memory - only the layout parts
+    are changed, everything else is copied through - so both ends can be
+    file paths or binary streams (e.g. io.BytesIO between pipeline stages).
+
     Args:
-        pptx_path: Path to input PPTX file
-        output_path: Path to save output PPTX file with translated layouts
+        pptx_path: Path to input PPTX file (or binary stream)
+        output_path: Path to save output PPTX file with translated layouts (or binary stream)
     """
-    logger.info(f"Translating slide layouts in: {pptx_path}")
+    source_name = pptx_path if isinstance(pptx_path, str) else "in-memory presentation"
+    logger.info(f"Translating slide layouts in: {source_name}")
 
     try:
-        # Create temp directory
-        temp_dir = tempfile.mkdtemp()
-        extract_dir = os.path.join(temp_dir, 'pptx_extracted')
-
-        # Extract PPTX as ZIP
-        with zipfile.ZipFile(pptx_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_dir)
+        with zipfile.ZipFile(pptx_path, 'r') as zip_in:
+            # Find and translate all slide layouts
+            layout_files = [name for name in zip_in.namelist() if _is_layout_part(name)]
 
-        # Find and translate all slide layouts
-        layout_dir = os.path.join(extract_dir, 'ppt', 'slideLayouts')
+            if not layout_files:
+                logger.warning("No slide layouts found")
+                _copy_package(pptx_path, output_path)
+                return
 
-        if not os.path.exists(layout_dir):
-            logger.warning("No slide layouts found")
-            shutil.copy(pptx_path, output_path)
-            return
+            logger.info(f"Found {len(layout_files)} layout files")
 
-        layout_files = [f for f in os.listdir(layout_dir) if f.endswith('.xml')]
-        logger.info(f"Found {len(layout_files)} layout files")
+            with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zip_out:
+                for item in zip_in.infolist():
+                    data = zip_in.read(item.filename)
 
-        # Translate each layout
-        for layout_file in layout_files:
-            layout_path = os.path.join(layout_dir, layout_file)
-            _translate_layout_file(layout_path)
+                    # Translate each layout
+                    if _is_layout_part(item.filename):
+                        translated = _translate_layout_xml(data.decode('utf-8'), os.path.basename(item.filename))
+                        if translated is not None:
+                            data = translated.encode('utf-8')
 
-        # Repack as PPTX
-        _repack_pptx(extract_dir, output_path)
+                    zip_out.writestr(item.filename, data)
 
-        # Cleanup
-        shutil.rmtree(temp_dir)
-
-        logger.info(f"Layout translation complete: {output_path}")
+        logger.info("Layout translation complete")
 
     except Exception as e:
         logger.error(f"Error translating layouts: {str(e)}", exc_info=True)
         # Fallback: copy original if translation fails
-        shutil.copy(pptx_path, output_path)
+        _copy_package(pptx_path, output_path)
         raise
 
-def _translate_layout_file(layout_xml_path: str) -> None:
+def _is_layout_part(name: str) -> bool:
+    """True for slide layout parts (ppt/slideLayouts/slideLayoutN.xml), not their rels"""
+    folder, _, file_name = name.rpartition('/')
+    return folder == 'ppt/slideLayouts' and file_name.endswith('.xml')
+
+def _copy_package(source: Union[str, BinaryIO], destination: Union[str, BinaryIO]) -> None:
+    """Copy a PPTX unchanged - paths or binary streams on either side"""
+    if isinstance(source, str) and isinstance(destination, str):
+        shutil.copy(source, destination)
+        return
+
+    src = open(source, 'rb') if isinstance(source, str) else source
+    dst = open(destination, 'wb') if isinstance(destination, str) else destination
+    try:
+        src.seek(0)
+        if dst is destination:
+            # Drop anything a failed attempt already wrote to the stream
+            dst.seek(0)
+            dst.truncate()
+        shutil.copyfileobj(src, dst)
+    finally:
+        if src is not source:
+            src.close()
+        if dst is not destination:
+            dst.close()
+
+def _translate_layout_xml(xml_content: str, layout_name: str) -> Optional[str]:
     """
-    Translate text elements in a layout XML file
+    Translate text elements in a layout XML part
     OPTIMIZED: Batches all layout text into ONE API call
 
     Args:
-        layout_xml_path: Path to slideLayout XML file
-    """
-    logger.info(f"Translating layout: {os.path.basename(layout_xml_path)}")
+        xml_content: slideLayout XML content
+        layout_name: Layout file name (for logging)
 
-    # Read XML
-    with open(layout_xml_path, 'r', encoding='utf-8') as f:
-        xml_content = f.read()
+    Returns:
+        Updated XML content, or None when nothing was translated
+    """
+    logger.info(f"Translating layout: {layout_name}")
 
     # Find all text elements with <a:t>text</a:t>
     pattern = r'<a:t>([^<]+)</a:t>'
@@ -168,7 +238,7 @@ def _translate_layout_file(layout_xml_path: str) -> None:
             continue
 
         # Skip if already translated (contains Arabic)
-        if any('\u0600' <= c <= '\u06FF' for c in original_text):
+        if _ARABIC_RE(original_text) is not None:
             continue
 
         texts_to_translate.append(original_text)
@@ -176,12 +246,12 @@ def _translate_layout_file(layout_xml_path: str) -> None:
 
     if not texts_to_translate:
         logger.info("  No text to translate in this layout")
-        return
+        return None
 
     # BATCH TRANSLATE: All texts in ONE API call
     logger.info(f"  Translating {len(texts_to_translate)} text elements in ONE API call...")
     try:
-        translated_list = _batch_translate_layout_texts(
+        translated_list = _translate_layout_texts_cached(
             texts_to_translate,
             Config.SOURCE_LANGUAGE,
             Config.TARGET_LANGUAGE
@@ -196,7 +266,7 @@ def _translate_layout_file(layout_xml_path: str) -> None:
 
     except Exception as e:
         logger.error(f"  Batch translation failed: {str(e)}")
-        return
+        return None
 
     # Replace in XML
     for original, translated in translations.items():
@@ -209,12 +279,10 @@ def _translate_layout_file(layout_xml_path: str) -> None:
             f'<a:t>{translated_escaped}</a:t>'
         )
 
-    # Write back
-    with open(layout_xml_path, 'w', encoding='utf-8') as f:
-        f.write(xml_content)
-
     logger.info(f"  Translated {len(translations)} text elements in layout")
 
+    return xml_content
+
 def _flip_layout_shapes_rtl(xml_content: str) -> str:
     """
     Flip shape positions in layout XML to RTL (mirror horizontally)
@@ -267,25 +335,6 @@ def _flip_layout_shapes_rtl(xml_content: str) -> str:
 
     return xml_content
 
-def _repack_pptx(extract_dir: str, output_path: str) -> None:
-    """
-    Repack extracted directory as PPTX file
-
-    Args:
-        extract_dir: Directory containing extracted PPTX contents
-        output_path: Path to save repacked PPTX
-    """
-    logger.info("Repacking PPTX...")
-
-    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(extract_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, extract_dir)
-                zipf.write(file_path, arcname)
-
-    logger.info(f"Repacked PPTX: {output_path}")
-
 if __name__ == "__main__":
     # Test layout translation
     if len(sys.argv) > 2:
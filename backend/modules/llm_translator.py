@@ -3,8 +3,12 @@ LLM Translator Module
 Handles translation using OpenAI GPT-4 or Google Gemini with context-aware prompts
 """
 from openai import OpenAI
+import hashlib
 import json
-from typing import Dict, List, Any
+import shelve
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional
 import sys
 import os
 
@@ -16,6 +20,19 @@ from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Persistent translation cache (shelve is not safe for concurrent writers)
+_TRANSLATION_CACHE_PATH = str(Config.CACHE_FOLDER / "translations")
+_TRANSLATION_CACHE_LOCK = threading.Lock()
+
+# Placeholders the batch translators return instead of a translation
+_FAILED_MARKERS = ("[ERROR", "[Translation missing]")
+
+# Deck batches: source characters per API call - Arabic output runs at up to
+# about one token per source character, so half of MAX_TOKENS leaves the other
+# half for the "<slide>/<element_id>" keys, the JSON around them and longer text
+_DECK_BATCH_CHARS = Config.MAX_TOKENS // 2
+_DECK_KEY_SEP = "/"
+
 # OpenAI client (initialized lazily)
 _openai_client = None
 _gemini_model = None
@@ -69,62 +86,324 @@ def translate_with_openai(
 
     try:
         # Build structured input for single API call
-        elements_to_translate = {}
-
-        for element in slide_structure["elements"]:
-            element_id = element["element_id"]
-            element_type = element["type"]
-
-            if element_type == "title":
-                text = element.get("text", "")
-                if text:
-                    elements_to_translate[element_id] = {
-                        "type": "title",
-                        "text": text
-                    }
-            elif element_type == "bullet_group":
-                bullets = element.get("bullets", [])
-                if bullets:
-                    elements_to_translate[element_id] = {
-                        "type": "bullets",
-                        "items": [b["text"] for b in bullets]
-                    }
-            else:
-                text = element.get("text", "")
-                if text:
-                    elements_to_translate[element_id] = {
-                        "type": "text",
-                        "text": text
-                    }
+        elements_to_translate = _collect_elements_to_translate(slide_structure)
 
         if not elements_to_translate:
             logger.info("No elements to translate")
             return {}
 
-        # Make SINGLE API call to translate ALL elements
+        # Make SINGLE API call to translate ALL elements (cached ones are skipped)
         logger.info(f"Translating {len(elements_to_translate)} elements in ONE API call")
 
-        # Route to the correct provider
-        if provider == "gemini":
-            translations = _translate_slide_batch_gemini(
-                elements_to_translate,
-                source_lang,
-                target_lang
-            )
-        else:  # Default to OpenAI
-            translations = _translate_slide_batch_openai(
-                elements_to_translate,
-                source_lang,
-                target_lang
-            )
-
-        logger.info(f"Translation complete. Translated {len(translations)} elements with 1 API call")
+        translations = _translate_elements(elements_to_translate, source_lang, target_lang)
+
+        logger.info(f"Translation complete. Translated {len(translations)} elements")
         return translations
 
     except Exception as e:
         logger.error(f"Translation error: {str(e)}", exc_info=True)
         raise
 
+def translate_all_with_openai(
+    slide_structures: List[Dict[str, Any]],
+    source_lang: str = "English",
+    target_lang: str = "Arabic"
+) -> List[Dict[str, Any]]:
+    """
+    Translate every slide of a deck with as few API calls as possible
+
+    Slides are packed whole into batches of up to _DECK_BATCH_CHARS source
+    characters (a slide larger than that gets a batch of its own). Each
+    batch is one API call with element ids prefixed by the slide index;
+    batches run concurrently, up to Config.MAX_PARALLEL_REQUESTS at a time.
+    Slides of a batch whose reply failed are retried one slide per call.
+    Content seen before (earlier in the deck or in a previous run) comes
+    from the translation cache, and repeated strings are sent only once.
+
+    Args:
+        slide_structures: Slide structures from slide_parser, in slide order
+        source_lang: Source language (default: English)
+        target_lang: Target language (default: Arabic)
+
+    Returns:
+        One dictionary per slide mapping element_id to translations
+        (same format as translate_with_openai)
+    """
+    provider = Config.LLM_PROVIDER.lower()
+    logger.info(f"Starting deck translation from {source_lang} to {target_lang} using {provider.upper()}")
+
+    # One flat element dict for the deck, keyed "<slide_idx>/<element_id>"
+    deck_elements = {}
+    for slide_idx, slide_structure in enumerate(slide_structures):
+        for element_id, element in _collect_elements_to_translate(slide_structure).items():
+            deck_elements[f"{slide_idx}{_DECK_KEY_SEP}{element_id}"] = element
+
+    deck_translations = [{} for _ in slide_structures]
+    if not deck_elements:
+        logger.info("No elements to translate")
+        return deck_translations
+
+    translations = _translate_elements(deck_elements, source_lang, target_lang, _DECK_BATCH_CHARS)
+
+    # Fan the results back out to their slides
+    for key, translation in translations.items():
+        slide_idx, _, element_id = key.partition(_DECK_KEY_SEP)
+        if slide_idx.isdigit() and int(slide_idx) < len(deck_translations):
+            deck_translations[int(slide_idx)][element_id] = translation
+        else:
+            logger.warning(f"Ignoring translation for unknown element: {key}")
+
+    logger.info(f"Deck translation complete for {len(slide_structures)} slides")
+    return deck_translations
+
+def _collect_elements_to_translate(slide_structure: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the batch input for one slide: element_id -> {"type", "text"/"items"}
+
+    Elements without text are left out.
+    """
+    elements_to_translate = {}
+
+    for element in slide_structure["elements"]:
+        element_id = element["element_id"]
+        element_type = element["type"]
+
+        if element_type == "title":
+            text = element.get("text", "")
+            if text:
+                elements_to_translate[element_id] = {
+                    "type": "title",
+                    "text": text
+                }
+        elif element_type == "bullet_group":
+            bullets = element.get("bullets", [])
+            if bullets:
+                elements_to_translate[element_id] = {
+                    "type": "bullets",
+                    "items": [b["text"] for b in bullets]
+                }
+        else:
+            text = element.get("text", "")
+            if text:
+                elements_to_translate[element_id] = {
+                    "type": "text",
+                    "text": text
+                }
+
+    return elements_to_translate
+
+def _element_chars(element: Dict[str, Any]) -> int:
+    """Source characters of one batch element (used to size deck batches)"""
+    if element["type"] == "bullets":
+        return sum(len(item) for item in element["items"])
+    return len(element["text"])
+
+def _translate_elements(
+    elements: Dict[str, Any],
+    source_lang: str,
+    target_lang: str,
+    max_batch_chars: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Translate elements (id -> element) with the translation cache in front of the API
+
+    Elements whose content was translated before are answered from the cache,
+    and identical uncached elements are sent only once. The rest goes out in
+    one batch, or - when max_batch_chars is given - in batches of up to that
+    many source characters that never split a slide, run concurrently (a
+    failed batch is retried slide by slide).
+
+    Returns:
+        Dict mapping every element id to its translation
+    """
+    translations = {}
+    cache_keys = {
+        element_id: _translation_cache_key(element, source_lang, target_lang)
+        for element_id, element in elements.items()
+    }
+    cached = _load_cached_translations(set(cache_keys.values()))
+
+    pending = {}   # cache key -> ids of the uncached elements with that content
+    to_send = {}   # first id of each uncached content -> element
+    for element_id, element in elements.items():
+        cache_key = cache_keys[element_id]
+        if cache_key in cached:
+            translations[element_id] = _copy_translation(cached[cache_key])
+        elif cache_key in pending:
+            pending[cache_key].append(element_id)
+        else:
+            pending[cache_key] = [element_id]
+            to_send[element_id] = element
+
+    if translations:
+        logger.info(f"{len(translations)} element(s) served from the translation cache")
+    if not to_send:
+        return translations
+
+    if max_batch_chars is None:
+        batches = [to_send]
+        translate_batch = _translate_element_batch
+    else:
+        batches = _pack_slide_batches(to_send, max_batch_chars)
+        translate_batch = _translate_deck_batch
+    logger.info(f"Sending {len(to_send)} unique element(s) in {len(batches)} API call(s)")
+
+    if len(batches) == 1:
+        translations.update(translate_batch(batches[0], source_lang, target_lang))
+    else:
+        max_workers = min(len(batches), Config.MAX_PARALLEL_REQUESTS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for batch_translations in executor.map(
+                lambda batch: translate_batch(batch, source_lang, target_lang),
+                batches
+            ):
+                translations.update(batch_translations)
+
+    # Copy each fresh translation to the duplicates and remember the good ones
+    fresh = {}
+    for cache_key, element_ids in pending.items():
+        translation = translations.get(element_ids[0])
+        if translation is None:
+            continue
+        for element_id in element_ids[1:]:
+            translations[element_id] = _copy_translation(translation)
+        if _is_cacheable_translation(elements[element_ids[0]], translation):
+            fresh[cache_key] = translation
+    _store_cached_translations(fresh)
+
+    return translations
+
+def _pack_slide_batches(elements: Dict[str, Any], max_chars: int) -> List[Dict[str, Any]]:
+    """
+    Pack "<slide_idx>/<element_id>" elements into batches of up to max_chars
+    source characters, keeping each slide whole (an oversized slide gets a
+    batch of its own)
+    """
+    batches = []
+    batch = {}
+    batch_chars = 0
+    for slide_elements in _split_by_slide(elements).values():
+        slide_chars = sum(_element_chars(element) for element in slide_elements.values())
+        if batch and batch_chars + slide_chars > max_chars:
+            batches.append(batch)
+            batch = {}
+            batch_chars = 0
+
+        batch.update(slide_elements)
+        batch_chars += slide_chars
+
+    if batch:
+        batches.append(batch)
+    return batches
+
+def _split_by_slide(elements: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Group "<slide_idx>/<element_id>" elements by slide, in order"""
+    slides = {}
+    for element_id, element in elements.items():
+        slide_key = element_id.partition(_DECK_KEY_SEP)[0]
+        slides.setdefault(slide_key, {})[element_id] = element
+    return slides
+
+def _translate_deck_batch(
+    elements: Dict[str, Any],
+    source_lang: str,
+    target_lang: str
+) -> Dict[str, Any]:
+    """
+    Translate one batch, retrying failed slides one at a time
+
+    A batch can hold several slides, and a reply that fails to parse (e.g. cut
+    off at MAX_TOKENS) marks every element in it as failed. Slides with a failed
+    element are sent again on their own, so one bad reply costs at most a retry
+    per slide instead of the translation of the whole batch.
+
+    Returns:
+        Dict mapping every element id to its translation
+    """
+    translations = _translate_element_batch(elements, source_lang, target_lang)
+
+    slides = _split_by_slide(elements)
+    if len(slides) < 2:
+        return translations
+
+    failed_slides = [
+        slide_elements for slide_elements in slides.values()
+        if not all(
+            _is_cacheable_translation(element, translations.get(element_id))
+            for element_id, element in slide_elements.items()
+        )
+    ]
+    if failed_slides:
+        logger.warning(f"Retrying {len(failed_slides)} of {len(slides)} slide(s) from a failed batch one at a time")
+        for slide_elements in failed_slides:
+            translations.update(_translate_element_batch(slide_elements, source_lang, target_lang))
+
+    return translations
+
+def _translation_cache_key(element: Dict[str, Any], source_lang: str, target_lang: str) -> str:
+    """
+    Cache key for one element: provider, model, languages, element type and content
+    """
+    provider = Config.LLM_PROVIDER.lower()
+    model = Config.GEMINI_MODEL if provider == "gemini" else Config.OPENAI_MODEL
+    content = element["items"] if element["type"] == "bullets" else element["text"]
+    payload = json.dumps([provider, model, source_lang, target_lang, element["type"], content],
+                         ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def _is_cacheable_translation(element: Dict[str, Any], translation: Any) -> bool:
+    """Only complete translations are cached - never error or missing markers"""
+    if element["type"] == "bullets":
+        items = translation
+        if not isinstance(items, list) or len(items) != len(element["items"]):
+            return False
+    else:
+        items = [translation]
+    return all(
+        isinstance(item, str) and item and not item.startswith(_FAILED_MARKERS)
+        for item in items
+    )
+
+def _copy_translation(translation: Any) -> Any:
+    """Bullet translations are lists - hand every element its own copy"""
+    return list(translation) if isinstance(translation, list) else translation
+
+def _load_cached_translations(cache_keys) -> Dict[str, Any]:
+    """
+    Look up translations in the disk cache; a broken cache is treated as all misses
+    """
+    try:
+        with _TRANSLATION_CACHE_LOCK, shelve.open(_TRANSLATION_CACHE_PATH) as cache:
+            return {key: cache[key] for key in cache_keys if key in cache}
+    except Exception as e:
+        logger.warning(f"Could not read translation cache: {str(e)}")
+        return {}
+
+def _store_cached_translations(translations: Dict[str, Any]) -> None:
+    """
+    Save translations to the disk cache; failures only cost future API calls
+    """
+    if not translations:
+        return
+    try:
+        with _TRANSLATION_CACHE_LOCK, shelve.open(_TRANSLATION_CACHE_PATH) as cache:
+            cache.update(translations)
+    except Exception as e:
+        logger.warning(f"Could not write translation cache: {str(e)}")
+
+def _translate_element_batch(
+    elements: Dict[str, Any],
+    source_lang: str,
+    target_lang: str
+) -> Dict[str, Any]:
+    """
+    Translate a batch of elements in one call to the configured provider
+    """
+    # Route to the correct provider
+    if Config.LLM_PROVIDER.lower() == "gemini":
+        return _translate_slide_batch_gemini(elements, source_lang, target_lang)
+    return _translate_slide_batch_openai(elements, source_lang, target_lang)  # Default to OpenAI
+
 def _translate_slide_batch_openai(
     elements: Dict[str, Any],
     source_lang: str,
@@ -174,7 +453,7 @@ Translate from {source_lang} to {target_lang} while maintaining:
 - Concise, impactful language suitable for executive presentations
 - Appropriate formality based on element type (titles are bold/impactful, body text is clear/professional)"""
 
-    user_prompt = f"""Translate ALL elements from this slide from {source_lang} to {target_lang}.
+    user_prompt = f"""Translate ALL elements from these slides from {source_lang} to {target_lang}.
 
 Elements to translate:
 {json.dumps(elements_list, ensure_ascii=False, indent=2)}
@@ -191,7 +470,7 @@ Requirements:
 - For "title" type: Translate as impactful, professional title
 - For "text" type: Translate as clear, professional body text
 - For "bullets" type: Return array of translated bullet points maintaining parallel structure
-- Preserve the element IDs exactly as given
+- Preserve the element IDs exactly as given, including any slide prefix before the "/" (e.g. "3/shape_0")
 - Return ONLY the JSON object, no additional text"""
 
     try:
@@ -267,7 +546,7 @@ Translate from {source_lang} to {target_lang} while maintaining:
 - Concise, impactful language suitable for executive presentations
 - Appropriate formality based on element type (titles are bold/impactful, body text is clear/professional)
 
-Translate ALL elements from this slide from {source_lang} to {target_lang}.
+Translate ALL elements from these slides from {source_lang} to {target_lang}.
 
 Elements to translate:
 {json.dumps(elements_list, ensure_ascii=False, indent=2)}
@@ -284,7 +563,7 @@ Requirements:
 - For "title" type: Translate as impactful, professional title
 - For "text" type: Translate as clear, professional body text
 - For "bullets" type: Return array of translated bullet points maintaining parallel structure
-- Preserve the element IDs exactly as given
+- Preserve the element IDs exactly as given, including any slide prefix before the "/" (e.g. "3/shape_0")
 - Return ONLY the JSON object, no additional text"""
 
     try:
@@ -377,7 +656,7 @@ Provide ONLY the {target_lang} translation, no explanations or additional text."
         )
 
         translation = response.choices[0].message.content.strip()
-        logger.debug(f"Translated '{text[:50]}...' → '{translation[:50]}...'")
+        logger.debug("Translated '%s...' → '%s...'", text[:50], translation[:50])
         return translation
 
     except Exception as e:
@@ -458,7 +737,7 @@ Format: ["translation 1", "translation 2", ...]"""
                 translations.append("[Translation missing]")
             translations = translations[:len(bullets)]
 
-        logger.debug(f"Translated {len(bullets)} bullets")
+        logger.debug("Translated %d bullets", len(bullets))
         return translations
 
     except Exception as e:
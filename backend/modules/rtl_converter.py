@@ -7,12 +7,16 @@ from pptx import Presentation
 from pptx.enum.text import PP_ALIGN
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 from lxml import etree
-from typing import Any
+from typing import Any, NamedTuple, Optional
+import copy
+import logging
 import sys
 import os
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path (once - re-imports/reloads don't stack entries)
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _BACKEND_DIR not in sys.path:
+    sys.path.insert(0, _BACKEND_DIR)
 
 from config import Config
 from utils.logger import setup_logger
@@ -26,6 +30,77 @@ NAMESPACES = {
     'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
 }
 
+# Clark-notation tags for run-level font elements
+_TAG_LATIN = f"{{{NAMESPACES['a']}}}latin"
+_TAG_CS = f"{{{NAMESPACES['a']}}}cs"
+
+# Only <p:sp> shapes carry a text frame (python-pptx's has_text_frame rule)
+_TAG_SP = f"{{{NAMESPACES['p']}}}sp"
+
+# Clark-notation tags for the group, transform and paragraph elements we build
+_TAG_GRPSP = f"{{{NAMESPACES['p']}}}grpSp"
+_TAG_NVGRPSPPR = f"{{{NAMESPACES['p']}}}nvGrpSpPr"
+_TAG_CNVPR = f"{{{NAMESPACES['p']}}}cNvPr"
+_TAG_CNVGRPSPPR = f"{{{NAMESPACES['p']}}}cNvGrpSpPr"
+_TAG_NVPR = f"{{{NAMESPACES['p']}}}nvPr"
+_TAG_GRPSPPR = f"{{{NAMESPACES['p']}}}grpSpPr"
+_TAG_XFRM = f"{{{NAMESPACES['a']}}}xfrm"
+_TAG_P_XFRM = f"{{{NAMESPACES['p']}}}xfrm"
+_TAG_OFF = f"{{{NAMESPACES['a']}}}off"
+_TAG_EXT = f"{{{NAMESPACES['a']}}}ext"
+_TAG_CHOFF = f"{{{NAMESPACES['a']}}}chOff"
+_TAG_CHEXT = f"{{{NAMESPACES['a']}}}chExt"
+_TAG_PPR = f"{{{NAMESPACES['a']}}}pPr"
+_TAG_P = f"{{{NAMESPACES['a']}}}p"
+_TAG_R = f"{{{NAMESPACES['a']}}}r"
+_TAG_CSLD = f"{{{NAMESPACES['p']}}}cSld"
+
+# Precompiled XPath expressions (compiled once instead of per find() call).
+# Paths walk the child axis only - every target sits at a fixed depth, so a
+# descendant (.//) scan would just visit the rest of the subtree for nothing.
+# Single-step child lookups skip XPath altogether and use find()/iterchildren()
+# with the Clark tags above.
+_CNVPR_XP = etree.XPath('./*/p:cNvPr', namespaces=NAMESPACES)
+_SPTREE_XP = etree.XPath('./p:cSld/p:spTree', namespaces=NAMESPACES)
+_ALL_CNVPR_XP = etree.XPath('.//p:cNvPr', namespaces=NAMESPACES)
+_SPPR_XP = etree.XPath('./p:spPr | ./p:grpSpPr', namespaces=NAMESPACES)
+_FIRST_RUN_XP = etree.XPath('(./a:p/a:r)[1]', namespaces=NAMESPACES)
+
+# Top-level graphic frames holding a chart (what python-pptx reports as
+# MSO_SHAPE_TYPE.CHART), read straight from the slide XML
+_CHART_URI = 'http://schemas.openxmlformats.org/drawingml/2006/chart'
+_CHART_FRAME_XP = etree.XPath(
+    './p:cSld/p:spTree/p:graphicFrame[a:graphic/a:graphicData/@uri = $uri][1]',
+    namespaces=NAMESPACES
+)
+
+# Shape type enum members bound once (compared against for every shape)
+_SHAPE_CHART = MSO_SHAPE_TYPE.CHART
+_SHAPE_GROUP = MSO_SHAPE_TYPE.GROUP
+_SHAPE_AUTO_SHAPE = MSO_SHAPE_TYPE.AUTO_SHAPE
+
+# xfrm/@rot is stored in 60000ths of a degree
+_ROT_FULL_TURN = 360 * 60000
+_ROT_HALF_TURN = 180 * 60000
+
+# Text boxes whose top-left corner is within this distance of a chart are
+# treated as chart labels and keep their position (~0.75 inches in EMUs)
+_CHART_TEXT_PROXIMITY = 700000
+
+def _xpath_first(xpath: etree.XPath, element) -> Any:
+    """
+    Evaluate a precompiled XPath and return the first match
+
+    Args:
+        xpath: Compiled etree.XPath expression
+        element: lxml element to evaluate against
+
+    Returns:
+        First matching element, or None if there is no match
+    """
+    matches = xpath(element)
+    return matches[0] if matches else None
+
 def flip_to_rtl_layout(input_path: str, output_path: str) -> None:
     """
     Convert PowerPoint slide from LTR to RTL layout
@@ -52,20 +127,7 @@ def flip_to_rtl_layout(input_path: str, output_path: str) -> None:
         # Load presentation
         prs = Presentation(input_path)
 
-        # Process all slides with normal RTL conversion
-        for slide_idx, slide in enumerate(prs.slides):
-            logger.info(f"Processing slide {slide_idx + 1}/{len(prs.slides)}")
-
-            # Flip shape positions horizontally (mirror the slide)
-            chart_regions = _get_chart_regions(slide)
-            slide_width = prs.slide_width
-            for shape in slide.shapes:
-                _flip_shape_position(shape, slide_width, chart_regions)
-
-            # Set text alignment to RIGHT and paragraph-level RTL
-            for shape in slide.shapes:
-                if shape.has_text_frame:
-                    _set_text_rtl_and_alignment(shape)
+        flip_presentation_to_rtl_layout(prs)
 
         # Save modified presentation
         prs.save(output_path)
@@ -75,6 +137,103 @@ def flip_to_rtl_layout(input_path: str, output_path: str) -> None:
         logger.error(f"Error during RTL conversion: {str(e)}", exc_info=True)
         raise
 
+def flip_presentation_to_rtl_layout(prs) -> None:
+    """
+    Convert an already-loaded presentation from LTR to RTL layout in place
+
+    Same conversion as flip_to_rtl_layout, for callers that already hold
+    the Presentation (e.g. right after grouping chart elements) and would
+    otherwise save and re-parse the whole package just to flip it.
+
+    Args:
+        prs: python-pptx Presentation object (modified in place)
+    """
+    slide_count = len(prs.slides)
+    slide_width = prs.slide_width
+
+    # Process all slides with normal RTL conversion
+    for slide_idx, slide in enumerate(prs.slides):
+        logger.info(f"Processing slide {slide_idx + 1}/{slide_count}")
+
+        # Snapshot shape geometry once per slide (read by every helper below)
+        geoms = [_snapshot_geom(shape) for shape in slide.shapes]
+
+        # Single pass: flip shape positions horizontally (mirror the slide),
+        # then set text alignment to RIGHT and paragraph-level RTL
+        # Chart-free slides (the common case) skip the region/grid setup and
+        # the near-chart test entirely
+        chart_regions = _get_chart_regions(geoms)
+        near_chart = [False] * len(geoms)
+        if chart_regions:
+            near_chart = _near_chart_mask(geoms, chart_regions)
+        for geom, is_near_chart in zip(geoms, near_chart):
+            _flip_shape_position(geom, slide_width, is_near_chart)
+            if geom.has_text_frame:
+                _set_text_rtl_and_alignment(geom.shape)
+
+
+class _ShapeGeom(NamedTuple):
+    """
+    Snapshot of the shape properties read repeatedly during layout passes
+
+    Values are captured once from the python-pptx proxy (each proxy read
+    walks the underlying XML). Position/size keep python-pptx semantics
+    and may be None for shapes without an explicit transform.
+    """
+    shape: Any
+    shape_type: Any
+    left: Optional[int]
+    top: Optional[int]
+    width: Optional[int]
+    height: Optional[int]
+    name: str
+    is_placeholder: bool
+    has_text_frame: bool
+
+def _snapshot_geom(shape) -> _ShapeGeom:
+    """
+    Capture a shape's type, geometry and identity in a single read
+
+    Args:
+        shape: PowerPoint shape object
+
+    Returns:
+        _ShapeGeom snapshot of the shape
+    """
+    return _ShapeGeom(
+        shape=shape,
+        shape_type=shape.shape_type,
+        left=shape.left,
+        top=shape.top,
+        width=shape.width,
+        height=shape.height,
+        name=getattr(shape, 'name', 'unnamed'),
+        is_placeholder=getattr(shape, 'is_placeholder', False),
+        # Tag check instead of the has_text_frame property dispatch
+        has_text_frame=shape._element.tag == _TAG_SP
+    )
+
+def _next_shape_id(slide) -> int:
+    """
+    Get the first unused shape id on a slide
+
+    Shape ids (cNvPr/@id) must be unique per slide, so new ids are taken
+    from one past the highest id already present.
+
+    Args:
+        slide: PowerPoint slide object
+
+    Returns:
+        Shape id that is not used by any element on the slide
+    """
+    max_id = 0
+    for cNvPr in _ALL_CNVPR_XP(slide._element):
+        try:
+            max_id = max(max_id, int(cNvPr.get('id')))
+        except (TypeError, ValueError):
+            continue
+    return max_id + 1
+
 def _get_shape_id(shape) -> str:
     """
     Get a unique identifier for a shape based on its PowerPoint ID
@@ -87,7 +246,7 @@ def _get_shape_id(shape) -> str:
     """
     try:
         # Try to get the shape's PowerPoint ID from XML
-        nvSpPr = shape._element.find('.//p:cNvPr', namespaces=NAMESPACES)
+        nvSpPr = _xpath_first(_CNVPR_XP, shape._element)
         if nvSpPr is not None:
             shape_id = nvSpPr.get('id')
             shape_name = nvSpPr.get('name', '')
@@ -107,18 +266,21 @@ def group_chart_elements(slide) -> int:
     2. For each chart, finds related elements (nearby shapes, text boxes)
     3. Groups the chart + related elements together
 
+    The slide's shapes are snapshotted once up front so each shape's
+    properties are read from XML a single time, and shapes are bucketed
+    per chart in one pass (no re-scan of the slide per chart).
+
     Args:
         slide: PowerPoint slide object
 
     Returns:
         Number of groups created
     """
-    charts_found = []
+    # Snapshot all shapes once - later passes read plain attributes
+    geoms = [_snapshot_geom(shape) for shape in slide.shapes]
 
     # Step 1: Find all charts on the slide
-    for shape in slide.shapes:
-        if shape.shape_type == MSO_SHAPE_TYPE.CHART:
-            charts_found.append(shape)
+    charts_found = [g for g in geoms if g.shape_type == _SHAPE_CHART]
 
     if not charts_found:
         return 0
@@ -126,109 +288,82 @@ def group_chart_elements(slide) -> int:
     logger.info(f"Found {len(charts_found)} chart(s) on slide - grouping related elements")
 
     groups_created = 0
-    already_grouped = set()  # Track shapes that have been grouped
+    already_grouped = set()  # Track charts that have been grouped (keyed on id(element))
+    # The "id_name" shape labels are only needed for log output
+    log_info = logger.isEnabledFor(logging.INFO)
 
-    # Step 2: Build a map of all shapes to their nearest chart
-    shape_to_nearest_chart = {}
+    # Step 2: Assign every shape to its nearest chart (single pass)
+    chart_to_shapes = {}  # chart_idx -> [(geom, distance), ...]
     # STRICT threshold: Only group elements that are EXACTLY touching/overlapping the chart (distance = 0)
     # This prevents grouping nearby text that's not actually part of the chart
     proximity_threshold = 0  # 0 inches - only elements that are touching/overlapping (distance = 0.0000)
 
-    for shape in slide.shapes:
-        shape_id = _get_shape_id(shape)
+    # Chart bounding boxes are computed once and reused for every shape;
+    # the grid narrows each shape's search to the charts it can reach
+    chart_boxes = [_bounding_box(chart_geom) for chart_geom in charts_found]
+    chart_grid = _ChartGrid(chart_boxes, margin=proximity_threshold)
 
+    for geom in geoms:
         # Skip charts themselves
-        if shape.shape_type == MSO_SHAPE_TYPE.CHART:
+        if geom.shape_type == _SHAPE_CHART:
             continue
 
         # Skip pre-existing groups (they may contain unrelated elements)
-        if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+        if geom.shape_type == _SHAPE_GROUP:
             continue
 
         # Skip title placeholders (slide titles should never be grouped with charts)
-        if hasattr(shape, 'is_placeholder') and shape.is_placeholder:
-            if hasattr(shape, 'name') and 'title' in shape.name.lower():
-                continue
-
-        # Find nearest chart for this shape
-        min_distance = float('inf')
-        nearest_chart_idx = None
+        if geom.is_placeholder and 'title' in geom.name.lower():
+            continue
 
-        for chart_idx, chart_shape in enumerate(charts_found):
-            distance = _distance_to_chart(shape, chart_shape)
-            if distance < min_distance:
-                min_distance = distance
-                nearest_chart_idx = chart_idx
+        # Find nearest chart for this shape among the charts it can reach
+        shape_box = _bounding_box(geom)
+        candidates = chart_grid.overlapping(shape_box) if shape_box is not None else None
+        nearest_chart_idx, min_distance = _nearest_chart(shape_box, chart_boxes, candidates)
 
         # Only associate with chart if within threshold
         if min_distance <= proximity_threshold:
-            shape_to_nearest_chart[shape_id] = (nearest_chart_idx, min_distance)
-            shape_name = shape.name if hasattr(shape, 'name') else 'unnamed'
-            logger.info(f"  Shape '{shape_name}' [ID:{shape_id}] -> Chart {nearest_chart_idx + 1} (distance: {min_distance/914400:.2f} in) [ADDED TO MAP]")
-        else:
-            if hasattr(shape, 'text') and shape.text and len(shape.text) > 0:
-                shape_name = shape.name if hasattr(shape, 'name') else 'unnamed'
-                logger.info(f"  Shape '{shape_name}' text='{shape.text[:30]}' -> TOO FAR (distance: {min_distance/914400:.2f} in > threshold {proximity_threshold/914400:.2f} in) [NOT ADDED]")
+            chart_to_shapes.setdefault(nearest_chart_idx, []).append((geom, min_distance))
+            if log_info:
+                logger.info(f"  Shape '{geom.name}' [ID:{_get_shape_id(geom.shape)}] -> Chart {nearest_chart_idx + 1} (distance: {min_distance/914400:.2f} in) [ADDED TO MAP]")
+        elif log_info:
+            # shape.text concatenates every run - only read it when it will be logged
+            text = getattr(geom.shape, 'text', None)
+            if text:
+                # The grid skipped far charts; measure them all for the log line
+                _, min_distance = _nearest_chart(shape_box, chart_boxes)
+                logger.info(f"  Shape '{geom.name}' text='{text[:30]}' -> TOO FAR (distance: {min_distance/914400:.2f} in > threshold {proximity_threshold/914400:.2f} in) [NOT ADDED]")
 
     # Step 3: For each chart, group it with its associated elements
-    for chart_idx, chart_shape in enumerate(charts_found):
+    next_group_id = _next_shape_id(slide)  # Seeded once, incremented per group
+    for chart_idx, chart_geom in enumerate(charts_found):
         # Skip if this chart was already grouped
-        chart_id = _get_shape_id(chart_shape)
+        chart_id = id(chart_geom.shape._element)
         if chart_id in already_grouped:
             logger.info(f"  Chart {chart_idx + 1} already grouped, skipping")
             continue
-
-        # Find related elements (assigned to this chart)
-        related_shapes = []
-        related_shapes.append(chart_shape)  # Start with the chart itself
         already_grouped.add(chart_id)
 
-        # Add shapes that belong to this chart
-        for shape in slide.shapes:
-            shape_id = _get_shape_id(shape)
-
-            # Skip if already grouped
-            if shape_id in already_grouped:
-                continue
-
-            # Skip groups (defensive check - they should already be filtered out)
-            if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
-                continue
-
-            # Skip charts (defensive check)
-            if shape.shape_type == MSO_SHAPE_TYPE.CHART:
-                continue
-
-            # Skip title placeholders (defensive check)
-            if hasattr(shape, 'is_placeholder') and shape.is_placeholder:
-                if hasattr(shape, 'name') and 'title' in shape.name.lower():
-                    continue
-
-            # Check if this shape is assigned to the current chart
-            if shape_id in shape_to_nearest_chart:
-                assigned_chart_idx, distance = shape_to_nearest_chart[shape_id]
-                if assigned_chart_idx == chart_idx:
-                    shape_name = shape.name if hasattr(shape, 'name') else 'unnamed'
-                    logger.info(f"  [ADDING] '{shape_name}' [ID:{shape_id}] to chart {chart_idx + 1} (was in map with distance {distance/914400:.2f} in)")
-                    related_shapes.append(shape)
-                    already_grouped.add(shape_id)
+        # Start with the chart itself, then the shapes assigned to it
+        related = [chart_geom]
+        for geom, distance in chart_to_shapes.get(chart_idx, []):
+            if log_info:
+                logger.info(f"  [ADDING] '{geom.name}' [ID:{_get_shape_id(geom.shape)}] to chart {chart_idx + 1} (was in map with distance {distance/914400:.2f} in)")
+            related.append(geom)
 
         # Group the chart and related shapes
-        if len(related_shapes) > 1:  # Only group if there are multiple elements
+        if len(related) > 1:  # Only group if there are multiple elements
             try:
                 # Log what we're about to group
-                logger.info(f"  Grouping chart {chart_idx + 1} with {len(related_shapes)} total shapes:")
-                for rs in related_shapes:
-                    shape_name = rs.name if hasattr(rs, 'name') else 'unnamed'
-                    shape_type_name = str(rs.shape_type)
-                    logger.info(f"    - {shape_name} (type: {shape_type_name})")
-
-                # Get the shapes collection
-                shapes_collection = slide.shapes
+                if log_info:
+                    logger.info(f"  Grouping chart {chart_idx + 1} with {len(related)} total shapes:")
+                    for rg in related:
+                        logger.info(f"    - {rg.name} (type: {rg.shape_type})")
 
                 # Group the shapes (chart + related elements)
                 # Note: python-pptx doesn't have a direct group method, we need to do it via XML
-                _group_shapes_xml(slide, related_shapes)
+                _group_shapes_xml(slide, related, next_group_id)
+                next_group_id += 1
                 groups_created += 1
                 logger.info(f"  Successfully grouped chart {chart_idx + 1}")
             except Exception as e:
@@ -238,10 +373,152 @@ def group_chart_elements(slide) -> int:
 
     return groups_created
 
+def _bounding_box(shape) -> Optional[tuple]:
+    """
+    Get a shape's bounding box as a plain (left, top, right, bottom) tuple
+
+    Accepts PowerPoint shapes or _ShapeGeom snapshots (anything exposing
+    left/top/width/height).
+
+    Args:
+        shape: PowerPoint shape or _ShapeGeom
+
+    Returns:
+        Bounding box tuple in EMUs, or None if the shape has no position
+    """
+    if shape.left is None or shape.top is None:
+        return None
+
+    return (
+        shape.left,
+        shape.top,
+        shape.left + (shape.width if shape.width else 0),
+        shape.top + (shape.height if shape.height else 0)
+    )
+
+def _nearest_chart(shape_box: Optional[tuple], chart_boxes: list, candidates=None) -> tuple:
+    """
+    Find the chart nearest to a shape
+
+    Chart boxes are computed once per slide by the caller, so each shape
+    only does the rectangle-distance arithmetic against plain tuples.
+    Squared distances are compared and only the winner is square-rooted.
+
+    Args:
+        shape_box: Shape bounding box from _bounding_box (or None)
+        chart_boxes: List of chart bounding boxes from _bounding_box
+        candidates: Ascending chart indices to consider (default: all),
+                    e.g. from _ChartGrid.overlapping
+
+    Returns:
+        Tuple of (nearest_chart_idx, distance in EMUs); (None, inf) if no
+        chart has a measurable distance to the shape
+    """
+    if shape_box is None:
+        return None, float('inf')
+
+    shape_left, shape_top, shape_right, shape_bottom = shape_box
+    min_sq = float('inf')
+    nearest_idx = None
+
+    if candidates is None:
+        candidates = range(len(chart_boxes))
+
+    for chart_idx in candidates:
+        chart_box = chart_boxes[chart_idx]
+        if chart_box is None:
+            continue
+        chart_left, chart_top, chart_right, chart_bottom = chart_box
+
+        # Gap along each axis (0 when the rectangles overlap/touch on that axis)
+        dx = max(0, chart_left - shape_right, shape_left - chart_right)
+        dy = max(0, chart_top - shape_bottom, shape_top - chart_bottom)
+        dist_sq = dx * dx + dy * dy
+
+        if dist_sq < min_sq:
+            min_sq = dist_sq
+            nearest_idx = chart_idx
+            if dist_sq == 0:
+                break  # Overlapping - nothing can be nearer
+
+    if nearest_idx is None:
+        return None, float('inf')
+    return nearest_idx, min_sq ** 0.5
+
+class _ChartGrid:
+    """
+    Uniform grid over chart bounding boxes for proximity queries
+
+    Each chart box, expanded by ``margin`` on every side, is registered in
+    every ``bucket``-sized cell it covers. A query then only has to test
+    the charts registered in the cells it touches instead of every chart
+    on the slide. Any chart that can be within ``margin`` of the query
+    shares at least one cell with it, so no match is ever missed.
+    """
+
+    def __init__(self, chart_boxes: list, margin: int = 0, bucket: int = 914400):
+        """
+        Args:
+            chart_boxes: List of chart bounding boxes from _bounding_box
+                         (None entries are ignored)
+            margin: Distance in EMUs within which a query should find a chart
+            bucket: Cell size in EMUs (default: 914400 = 1 inch)
+        """
+        self.boxes = chart_boxes
+        self.chart_count = len(chart_boxes)
+        self.margin = margin
+        self.bucket = bucket
+        self.cells = {}
+
+        for chart_idx, box in enumerate(chart_boxes):
+            if box is None:
+                continue
+            left, top, right, bottom = box
+            for bx in range((left - margin) // bucket, (right + margin) // bucket + 1):
+                for by in range((top - margin) // bucket, (bottom + margin) // bucket + 1):
+                    self.cells.setdefault((bx, by), []).append(chart_idx)
+
+    def at_point(self, x: int, y: int) -> list:
+        """
+        Get the indices of charts whose expanded box may contain a point
+
+        Returns:
+            Ascending list of candidate chart indices
+        """
+        return self.cells.get((x // self.bucket, y // self.bucket), [])
+
+    def overlapping(self, box: tuple):
+        """
+        Get the indices of charts whose expanded box may touch a rectangle
+
+        Args:
+            box: (left, top, right, bottom) tuple in EMUs
+
+        Returns:
+            Ascending candidate chart indices
+        """
+        left, top, right, bottom = box
+        bucket = self.bucket
+        x_range = range(left // bucket, right // bucket + 1)
+        y_range = range(top // bucket, bottom // bucket + 1)
+
+        # A large shape covers many cells - testing every chart is cheaper then
+        if len(x_range) * len(y_range) > self.chart_count:
+            return range(self.chart_count)
+
+        found = set()
+        for bx in x_range:
+            for by in y_range:
+                found.update(self.cells.get((bx, by), ()))
+        return sorted(found)
+
 def _distance_to_chart(shape, chart) -> float:
     """
     Calculate the minimum distance from a shape to a chart
 
+    Accepts PowerPoint shapes or _ShapeGeom snapshots (anything exposing
+    left/top/width/height).
+
     Args:
         shape: PowerPoint shape
         chart: PowerPoint chart shape
@@ -249,61 +526,27 @@ def _distance_to_chart(shape, chart) -> float:
     Returns:
         Minimum distance in EMUs
     """
-    if shape.left is None or shape.top is None or chart.left is None or chart.top is None:
-        return float('inf')
-
-    # Get shape boundaries
-    shape_left = shape.left
-    shape_top = shape.top
-    shape_right = shape.left + (shape.width if shape.width else 0)
-    shape_bottom = shape.top + (shape.height if shape.height else 0)
-
-    # Get chart boundaries
-    chart_left = chart.left
-    chart_top = chart.top
-    chart_right = chart.left + (chart.width if chart.width else 0)
-    chart_bottom = chart.top + (chart.height if chart.height else 0)
-
-    # Calculate minimum distance between rectangles
-    # If they overlap, distance is 0
-    if (shape_right >= chart_left and shape_left <= chart_right and
-        shape_bottom >= chart_top and shape_top <= chart_bottom):
-        return 0
-
-    # Calculate distance to nearest edge
-    dx = 0
-    if shape_right < chart_left:
-        dx = chart_left - shape_right
-    elif shape_left > chart_right:
-        dx = shape_left - chart_right
-
-    dy = 0
-    if shape_bottom < chart_top:
-        dy = chart_top - shape_bottom
-    elif shape_top > chart_bottom:
-        dy = shape_top - chart_bottom
-
-    # Return Euclidean distance
-    return (dx * dx + dy * dy) ** 0.5
+    _, distance = _nearest_chart(_bounding_box(shape), [_bounding_box(chart)])
+    return distance
 
 def _is_shape_near_region(shape, region: dict, proximity: int = 700000) -> bool:
     """
     Check if a shape is near a region
 
     Args:
-        shape: PowerPoint shape
+        shape: PowerPoint shape (or _ShapeGeom snapshot)
         region: Dictionary with 'left', 'top', 'right', 'bottom' keys
         proximity: Distance threshold in EMUs
 
     Returns:
         True if shape is near the region
     """
-    if shape.left is None or shape.top is None:
-        return False
-
     shape_left = shape.left
     shape_top = shape.top
 
+    if shape_left is None or shape_top is None:
+        return False
+
     # Check if shape is within proximity of region
     if (shape_left >= region['left'] - proximity and
         shape_left <= region['right'] + proximity and
@@ -313,7 +556,7 @@ def _is_shape_near_region(shape, region: dict, proximity: int = 700000) -> bool:
 
     return False
 
-def _group_shapes_xml(slide, shapes_to_group: list) -> None:
+def _group_shapes_xml(slide, shapes_to_group: list, group_id: Optional[int] = None) -> None:
     """
     Group shapes together using XML manipulation
 
@@ -321,7 +564,9 @@ def _group_shapes_xml(slide, shapes_to_group: list) -> None:
 
     Args:
         slide: PowerPoint slide object
-        shapes_to_group: List of shapes to group
+        shapes_to_group: List of _ShapeGeom snapshots of the shapes to group
+        group_id: Unused shape id for the new group (default: next free id
+                  on the slide, see _next_shape_id)
     """
     try:
         if len(shapes_to_group) < 2:
@@ -330,65 +575,79 @@ def _group_shapes_xml(slide, shapes_to_group: list) -> None:
 
         # Get slide's shape tree (spTree)
         slide_element = slide._element
-        spTree = slide_element.find('.//p:spTree', namespaces=NAMESPACES)
+        spTree = _xpath_first(_SPTREE_XP, slide_element)
 
         if spTree is None:
             logger.error("Could not find shape tree in slide")
             return
 
-        # Calculate bounding box for the group
-        min_left = min(s.left for s in shapes_to_group if s.left is not None)
-        min_top = min(s.top for s in shapes_to_group if s.top is not None)
-        max_right = max(s.left + s.width for s in shapes_to_group if s.left is not None and s.width is not None)
-        max_bottom = max((s.top if s.top is not None else 0) + (s.height if s.height is not None else 0) for s in shapes_to_group)
+        # Single pass over the snapshots: calculate the group bounding box and
+        # capture all absolute positions BEFORE any XML manipulation
+        min_left = min_top = max_right = max_bottom = None
+        shape_positions = []
+        for geom in shapes_to_group:
+            left, top, width, height = geom.left, geom.top, geom.width, geom.height
+
+            if left is not None:
+                if min_left is None or left < min_left:
+                    min_left = left
+                if width is not None and (max_right is None or left + width > max_right):
+                    max_right = left + width
+            if top is not None and (min_top is None or top < min_top):
+                min_top = top
+            bottom = (top or 0) + (height or 0)
+            if max_bottom is None or bottom > max_bottom:
+                max_bottom = bottom
+
+            shape_positions.append({
+                'element': geom.shape._element,
+                'left': left or 0,
+                'top': top or 0
+            })
+
+        if min_left is None or min_top is None or max_right is None:
+            raise ValueError("Shapes to group have no position/size to build a bounding box from")
 
         group_width = max_right - min_left
         group_height = max_bottom - min_top
 
         # Create group shape element (grpSp)
-        grpSp = etree.Element(f"{{{NAMESPACES['p']}}}grpSp")
+        grpSp = etree.Element(_TAG_GRPSP)
 
         # Add nvGrpSpPr (non-visual group shape properties)
-        nvGrpSpPr = etree.SubElement(grpSp, f"{{{NAMESPACES['p']}}}nvGrpSpPr")
-        cNvPr = etree.SubElement(nvGrpSpPr, f"{{{NAMESPACES['p']}}}cNvPr")
-        cNvPr.set('id', str(len(spTree) + 1))
-        cNvPr.set('name', f'Group {len(spTree) + 1}')
-        etree.SubElement(nvGrpSpPr, f"{{{NAMESPACES['p']}}}cNvGrpSpPr")
-        etree.SubElement(nvGrpSpPr, f"{{{NAMESPACES['p']}}}nvPr")
+        nvGrpSpPr = etree.SubElement(grpSp, _TAG_NVGRPSPPR)
+        cNvPr = etree.SubElement(nvGrpSpPr, _TAG_CNVPR)
+        if group_id is None:
+            group_id = _next_shape_id(slide)
+        cNvPr.set('id', str(group_id))
+        cNvPr.set('name', f'Group {group_id}')
+        etree.SubElement(nvGrpSpPr, _TAG_CNVGRPSPPR)
+        etree.SubElement(nvGrpSpPr, _TAG_NVPR)
 
         # Add grpSpPr (group shape properties) with transform
-        grpSpPr = etree.SubElement(grpSp, f"{{{NAMESPACES['p']}}}grpSpPr")
-        xfrm = etree.SubElement(grpSpPr, f"{{{NAMESPACES['a']}}}xfrm")
+        grpSpPr = etree.SubElement(grpSp, _TAG_GRPSPPR)
+        xfrm = etree.SubElement(grpSpPr, _TAG_XFRM)
 
         # Offset (group position)
-        off = etree.SubElement(xfrm, f"{{{NAMESPACES['a']}}}off")
+        off = etree.SubElement(xfrm, _TAG_OFF)
         off.set('x', str(min_left))
         off.set('y', str(min_top))
 
         # Extents (group size)
-        ext = etree.SubElement(xfrm, f"{{{NAMESPACES['a']}}}ext")
+        ext = etree.SubElement(xfrm, _TAG_EXT)
         ext.set('cx', str(group_width))
         ext.set('cy', str(group_height))
 
         # Child offset (always 0,0 for groups)
-        chOff = etree.SubElement(xfrm, f"{{{NAMESPACES['a']}}}chOff")
+        chOff = etree.SubElement(xfrm, _TAG_CHOFF)
         chOff.set('x', '0')
         chOff.set('y', '0')
 
         # Child extents (same as group extents)
-        chExt = etree.SubElement(xfrm, f"{{{NAMESPACES['a']}}}chExt")
+        chExt = etree.SubElement(xfrm, _TAG_CHEXT)
         chExt.set('cx', str(group_width))
         chExt.set('cy', str(group_height))
 
-        # FIRST: Capture all absolute positions BEFORE any XML manipulation
-        shape_positions = []
-        for shape in shapes_to_group:
-            shape_positions.append({
-                'element': shape._element,
-                'left': shape.left if shape.left is not None else 0,
-                'top': shape.top if shape.top is not None else 0
-            })
-
         # THEN: Move shapes into the group and adjust their coordinates
         for shape_info in shape_positions:
             shape_element = shape_info['element']
@@ -399,30 +658,30 @@ def _group_shapes_xml(slide, shapes_to_group: list) -> None:
             rel_left = abs_left - min_left
             rel_top = abs_top - min_top
 
-            logger.debug(f"  Shape absolute: ({abs_left}, {abs_top})")
-            logger.debug(f"  Group min: ({min_left}, {min_top})")
-            logger.debug(f"  Calculated relative: ({rel_left}, {rel_top})")
+            logger.debug("  Shape absolute: (%s, %s)", abs_left, abs_top)
+            logger.debug("  Group min: (%s, %s)", min_left, min_top)
+            logger.debug("  Calculated relative: (%s, %s)", rel_left, rel_top)
 
             # Adjust shape position in XML to be relative to group
             # Need to check different XML structures for different shape types
-            shape_spPr = shape_element.find('.//p:spPr', namespaces=NAMESPACES)
+            shape_spPr = _xpath_first(_SPPR_XP, shape_element)
 
             # For charts, the structure might be different - check graphicFrame
             if shape_spPr is None:
                 # Try graphicFrame for charts
-                shape_spPr = shape_element.find('.//p:xfrm', namespaces=NAMESPACES)
+                shape_spPr = shape_element.find(_TAG_P_XFRM)
                 if shape_spPr is not None:
-                    off = shape_spPr.find('.//a:off', namespaces=NAMESPACES)
+                    off = shape_spPr.find(_TAG_OFF)
                     if off is not None:
-                        logger.debug(f"  Found chart xfrm/off - setting to ({rel_left}, {rel_top})")
+                        logger.debug("  Found chart xfrm/off - setting to (%s, %s)", rel_left, rel_top)
                         off.set('x', str(int(rel_left)))
                         off.set('y', str(int(rel_top)))
             else:
-                shape_xfrm = shape_spPr.find('.//a:xfrm', namespaces=NAMESPACES)
+                shape_xfrm = shape_spPr.find(_TAG_XFRM)
                 if shape_xfrm is not None:
-                    shape_off = shape_xfrm.find('.//a:off', namespaces=NAMESPACES)
+                    shape_off = shape_xfrm.find(_TAG_OFF)
                     if shape_off is not None:
-                        logger.debug(f"  Found shape spPr/xfrm/off - setting to ({rel_left}, {rel_top})")
+                        logger.debug("  Found shape spPr/xfrm/off - setting to (%s, %s)", rel_left, rel_top)
                         # Set relative coordinates
                         shape_off.set('x', str(int(rel_left)))
                         shape_off.set('y', str(int(rel_top)))
@@ -452,46 +711,58 @@ def detect_chart_slides(pptx_path: str) -> list:
     Returns:
         List of slide indices (0-based) that contain charts
     """
-    chart_slide_indices = []
-
     try:
-        prs = Presentation(pptx_path)
+        return detect_chart_slides_in_presentation(Presentation(pptx_path))
+    except Exception as e:
+        logger.error(f"Error detecting chart slides: {str(e)}")
+        return []
+
+def detect_chart_slides_in_presentation(prs) -> list:
+    """
+    Detect which slides of an already-loaded presentation contain charts
+
+    Args:
+        prs: python-pptx Presentation object
 
-        for slide_idx, slide in enumerate(prs.slides):
-            has_chart = False
-            for shape in slide.shapes:
-                if shape.shape_type == MSO_SHAPE_TYPE.CHART:
-                    has_chart = True
-                    break
+    Returns:
+        List of slide indices (0-based) that contain charts
+    """
+    chart_slide_indices = []
 
-            if has_chart:
-                chart_slide_indices.append(slide_idx)
-                logger.info(f"Slide {slide_idx + 1} contains chart(s)")
+    for slide_idx, slide in enumerate(prs.slides):
+        # Query the XML directly - no shape proxies are built just to
+        # ask each one for its type
+        has_chart = bool(_CHART_FRAME_XP(slide._element, uri=_CHART_URI))
 
-        logger.info(f"Found {len(chart_slide_indices)} slide(s) with charts")
+        if has_chart:
+            chart_slide_indices.append(slide_idx)
+            logger.info(f"Slide {slide_idx + 1} contains chart(s)")
 
-    except Exception as e:
-        logger.error(f"Error detecting chart slides: {str(e)}")
+    logger.info(f"Found {len(chart_slide_indices)} slide(s) with charts")
 
     return chart_slide_indices
 
-def _get_chart_regions(slide) -> list:
+def _get_chart_regions(geoms: list) -> list:
     """
     Get bounding regions of all charts on the slide
 
+    Args:
+        geoms: List of _ShapeGeom snapshots for the slide's shapes
+
     Returns list of dictionaries with chart boundaries:
     [{'left': x, 'top': y, 'right': x2, 'bottom': y2}, ...]
     """
     chart_regions = []
 
-    for shape in slide.shapes:
-        if shape.shape_type == MSO_SHAPE_TYPE.CHART:
-            if shape.left is not None and shape.width is not None:
+    for geom in geoms:
+        if geom.shape_type == _SHAPE_CHART:
+            if geom.left is not None and geom.width is not None:
+                top = geom.top or 0
                 chart_regions.append({
-                    'left': shape.left,
-                    'top': shape.top if shape.top is not None else 0,
-                    'right': shape.left + shape.width,
-                    'bottom': (shape.top if shape.top is not None else 0) + (shape.height if shape.height is not None else 0)
+                    'left': geom.left,
+                    'top': top,
+                    'right': geom.left + geom.width,
+                    'bottom': top + (geom.height or 0)
                 })
 
     logger.info(f"Found {len(chart_regions)} chart(s) on slide")
@@ -509,15 +780,15 @@ def _adjust_overlapping_groups(slide, slide_width: int) -> None:
         slide: PowerPoint slide object
         slide_width: Width of the slide in EMUs
     """
-    # Collect all groups on the slide
+    # Collect all groups on the slide (geometry snapshotted once)
     groups = []
     for shape in slide.shapes:
-        if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
-            groups.append(shape)
+        if shape.shape_type == _SHAPE_GROUP:
+            groups.append(_snapshot_geom(shape))
 
     # Only process slides with 2+ groups
     if len(groups) < 2:
-        logger.debug(f"Slide has {len(groups)} group(s) - skipping overlap adjustment")
+        logger.debug("Slide has %d group(s) - skipping overlap adjustment", len(groups))
         return
 
     logger.info(f"Checking for overlaps among {len(groups)} groups on slide")
@@ -568,52 +839,85 @@ def _adjust_overlapping_groups(slide, slide_width: int) -> None:
 
             # Make sure we don't go off the slide
             if new_left + next_width <= slide_width:
-                next_group.left = int(new_left)
+                next_group.shape.left = int(new_left)
+                # Keep the snapshot in sync - it is "current" on the next iteration
+                groups_sorted[i + 1] = next_group._replace(left=int(new_left))
                 adjusted_count += 1
-                logger.info(f"  Adjusted group '{next_group.name if hasattr(next_group, 'name') else 'unnamed'}' - added {shift_amount/914400:.2f}\" spacing")
+                logger.info(f"  Adjusted group '{next_group.name}' - added {shift_amount/914400:.2f}\" spacing")
             else:
                 # If we can't shift right, try shifting the current group left
                 shift_current = min_spacing - horizontal_gap
                 new_current_left = current_left - shift_current
 
                 if new_current_left >= 0:
-                    current.left = int(new_current_left)
+                    current.shape.left = int(new_current_left)
+                    groups_sorted[i] = current._replace(left=int(new_current_left))
                     adjusted_count += 1
-                    logger.info(f"  Adjusted group '{current.name if hasattr(current, 'name') else 'unnamed'}' leftward - added {shift_current/914400:.2f}\" spacing")
+                    logger.info(f"  Adjusted group '{current.name}' leftward - added {shift_current/914400:.2f}\" spacing")
                 else:
-                    logger.warning(f"  Cannot adjust groups '{current.name if hasattr(current, 'name') else 'unnamed'}' and '{next_group.name if hasattr(next_group, 'name') else 'unnamed'}' - insufficient space")
+                    logger.warning(f"  Cannot adjust groups '{current.name}' and '{next_group.name}' - insufficient space")
 
     if adjusted_count > 0:
         logger.info(f"Auto-spacing: Adjusted {adjusted_count} group position(s) to prevent overlap")
     else:
         logger.info(f"Auto-spacing: No overlaps detected")
 
-def _is_near_chart(shape, chart_regions, proximity=700000) -> bool:
+def _near_chart_mask(geoms: list, chart_regions: list) -> list:
     """
-    Check if a shape is near any chart
+    Decide for every shape on a slide whether it is a text box near a chart
+
+    The whole slide is tested in one batch against a single _ChartGrid
+    instead of re-entering the chart test from each per-shape flip call.
 
     Args:
-        shape: Shape to check
+        geoms: List of _ShapeGeom snapshots for the slide's shapes
         chart_regions: List of chart boundary dictionaries
-        proximity: Distance threshold in EMUs (default: 700000 = ~0.75 inches)
-                   Captures chart titles, legends, and labels directly attached to the chart
 
     Returns:
-        True if shape is near a chart, False otherwise
+        List of booleans, parallel to geoms
     """
-    if not chart_regions:
-        return False
+    chart_grid = _ChartGrid(
+        [(c['left'], c['top'], c['right'], c['bottom']) for c in chart_regions],
+        margin=_CHART_TEXT_PROXIMITY
+    )
+    return [
+        geom.has_text_frame and _is_near_chart(geom, chart_grid)
+        for geom in geoms
+    ]
+
+def _is_near_chart(shape, chart_grid: '_ChartGrid') -> bool:
+    """
+    Check if a shape is near any chart
 
-    shape_left = shape.left if shape.left is not None else 0
-    shape_top = shape.top if shape.top is not None else 0
+    Args:
+        shape: Shape (or _ShapeGeom snapshot) to check
+        chart_grid: _ChartGrid over the slide's charts; its margin is the distance
+                    threshold in EMUs (_CHART_TEXT_PROXIMITY = ~0.75 inches), which
+                    captures chart titles, legends, and labels attached to the chart
+
+    Returns:
+        True if shape is near a chart, False otherwise
+    """
+    proximity = chart_grid.margin
 
-    for chart in chart_regions:
-        # Check if shape is within proximity of chart region
+    shape_left = shape.left
+    shape_top = shape.top
+    if shape_left is None:
+        shape_left = 0
+    if shape_top is None:
+        shape_top = 0
+
+    # Only the charts registered in the shape's grid cell can be in range;
+    # the grid holds them as plain (left, top, right, bottom) tuples
+    boxes = chart_grid.boxes
+    candidates = [boxes[i] for i in chart_grid.at_point(shape_left, shape_top)]
+
+    for chart_left, chart_top, chart_right, chart_bottom in candidates:
+        # Check if shape is within proximity of chart region (x first - a
+        # miss on that axis rejects without looking at y)
         # Use a large exclusion zone to capture all chart-related text, labels, legends, titles
-        if (shape_left >= chart['left'] - proximity and
-            shape_left <= chart['right'] + proximity and
-            shape_top >= chart['top'] - proximity and
-            shape_top <= chart['bottom'] + proximity):
+        if (chart_left - proximity <= shape_left <= chart_right + proximity and
+                chart_top - proximity <= shape_top <= chart_bottom + proximity):
             return True
 
     return False
@@ -637,7 +941,7 @@ def _set_slide_rtl_property(slide) -> None:
         slide_element = slide._element
 
         # Find p:cSld (common slide data) element
-        cSld = slide_element.find('.//p:cSld', namespaces=NAMESPACES)
+        cSld = slide_element.find(_TAG_CSLD)
 
         if cSld is not None:
             # Set RTL attribute on the slide (PowerPoint's built-in property)
@@ -668,15 +972,20 @@ def _set_text_rtl_and_alignment(shape) -> None:
     if not shape.has_text_frame:
         return
 
-    text_frame = shape.text_frame
+    # Work on the <a:p> elements directly - a single child scan per shape
+    # instead of a _Paragraph proxy plus pPr search per paragraph
+    txBody = shape.text_frame._txBody
 
-    for paragraph in text_frame.paragraphs:
+    for p_element in txBody.iterchildren(_TAG_P):
         try:
-            # Set RIGHT alignment
-            paragraph.alignment = PP_ALIGN.RIGHT
+            pPr = p_element.get_or_add_pPr()
+
+            # Set RIGHT alignment (same attribute PP_ALIGN.RIGHT writes)
+            pPr.set('algn', 'r')
 
             # REMOVE any existing RTL attribute
-            _remove_rtl_from_paragraph(paragraph)
+            if pPr.attrib.pop('rtl', None) is not None:
+                logger.debug("Removed RTL attribute from paragraph")
         except Exception as e:
             logger.warning(f"Could not set alignment for paragraph: {str(e)}")
 
@@ -743,11 +1052,10 @@ def _remove_rtl_from_paragraph(paragraph) -> None:
         p_element = paragraph._element
 
         # Get <a:pPr> (paragraph properties)
-        pPr = p_element.find('.//a:pPr', namespaces=NAMESPACES)
+        pPr = p_element.find(_TAG_PPR)
 
-        if pPr is not None and 'rtl' in pPr.attrib:
-            # Remove RTL attribute
-            del pPr.attrib['rtl']
+        # Remove RTL attribute (single lookup+remove)
+        if pPr is not None and pPr.attrib.pop('rtl', None) is not None:
             logger.debug("Removed RTL attribute from paragraph")
 
     except Exception as e:
@@ -767,21 +1075,21 @@ def _set_rtl_via_xml(paragraph) -> None:
     p_element = paragraph._element
 
     # Get or create <a:pPr> (paragraph properties)
-    pPr = p_element.find('.//a:pPr', namespaces=NAMESPACES)
+    pPr = p_element.find(_TAG_PPR)
 
     if pPr is None:
         # Create <a:pPr> if it doesn't exist
         # Insert before <a:r> (run) elements
-        pPr = etree.Element(f"{{{NAMESPACES['a']}}}pPr")
+        pPr = etree.Element(_TAG_PPR)
         # Insert as first child
         p_element.insert(0, pPr)
 
     # Set RTL attribute
     pPr.set('rtl', '1')  # 1 = RTL, 0 = LTR
 
-    logger.debug(f"Set RTL property via XML for paragraph")
+    logger.debug("Set RTL property via XML for paragraph")
 
-def _flip_shape_position(shape, slide_width: int, chart_regions: list = None) -> None:
+def _flip_shape_position(geom: _ShapeGeom, slide_width: int, near_chart: bool) -> None:
     """
     Flip text box position horizontally (mirror across slide center)
     PRESERVES width and height by explicitly setting them
@@ -800,29 +1108,33 @@ def _flip_shape_position(shape, slide_width: int, chart_regions: list = None) ->
     - New position: 9144000 - (1000000 + 3000000) = 5144000
 
     Args:
-        shape: PowerPoint shape to flip
+        geom: _ShapeGeom snapshot of the shape to flip (geometry is read from
+              the snapshot; the shape itself is only touched to write)
         slide_width: Width of the slide in EMUs (English Metric Units)
-        chart_regions: List of chart boundary regions (optional)
+        near_chart: Whether the shape is a text box near a chart (from _near_chart_mask)
     """
+    shape = geom.shape
     try:
         # SKIP CHARTS - they have internal layout that shouldn't be flipped
-        if shape.shape_type == MSO_SHAPE_TYPE.CHART:
-            logger.debug(f"Skipping chart shape - charts maintain original position for RTL")
+        if geom.shape_type == _SHAPE_CHART:
+            logger.debug("Skipping chart shape - charts maintain original position for RTL")
             return
 
         # SKIP TEXT BOXES NEAR CHARTS - they likely belong to the chart
-        if chart_regions and shape.has_text_frame and _is_near_chart(shape, chart_regions):
-            logger.debug(f"Skipping text box near chart: '{shape.text.strip()[:30] if shape.text else 'empty'}'")
+        if near_chart:
+            if logger.isEnabledFor(logging.DEBUG):
+                text = shape.text
+                logger.debug("Skipping text box near chart: '%s'", text.strip()[:30] if text else 'empty')
             return
 
-        old_left = shape.left
-        old_top = shape.top
-        shape_width = shape.width
-        shape_height = shape.height
+        old_left = geom.left
+        old_top = geom.top
+        shape_width = geom.width
+        shape_height = geom.height
 
         # Skip if position or size is None (can happen with certain shape types)
         if old_left is None or shape_width is None:
-            logger.debug(f"Skipping shape with None position/size")
+            logger.debug("Skipping shape with None position/size")
             return
 
         # Calculate new left position (mirror)
@@ -834,23 +1146,51 @@ def _flip_shape_position(shape, slide_width: int, chart_regions: list = None) ->
 
         # Apply new position AND explicitly preserve width/height
         # This is CRITICAL for placeholders that don't have explicit dimensions
-        shape.left = new_left
-        shape.top = old_top if old_top is not None else 0
-        shape.width = shape_width
-        shape.height = shape_height if shape_height is not None else shape_width
+        _set_xfrm(
+            shape._element,
+            new_left,
+            old_top or 0,
+            shape_width,
+            shape_height if shape_height is not None else shape_width
+        )
 
         # MIRROR ARROWS: Flip arrow shapes horizontally for RTL
-        # Check if this is an arrow shape (AutoShape with "Arrow" in name)
-        if shape.shape_type == MSO_SHAPE_TYPE.AUTO_SHAPE and hasattr(shape, 'name'):
-            if 'Arrow' in shape.name or 'arrow' in shape.name:
+        # Check if this is an arrow shape (AutoShape with "arrow" in name, any case)
+        if geom.shape_type == _SHAPE_AUTO_SHAPE:
+            if geom.name and 'arrow' in geom.name.lower():
                 _flip_shape_horizontally(shape)
-                logger.debug(f"Mirrored arrow shape: {shape.name}")
+                logger.debug("Mirrored arrow shape: %s", geom.name)
 
-        logger.debug(f"Flipped shape position: {old_left} → {new_left} (preserved w={shape_width}, h={shape_height})")
+        logger.debug("Flipped shape position: %s → %s (preserved w=%s, h=%s)", old_left, new_left, shape_width, shape_height)
 
     except Exception as e:
         logger.warning(f"Could not flip shape position: {str(e)}")
 
+def _set_xfrm(shape_element, x: int, y: int, cx: int, cy: int) -> None:
+    """
+    Write a shape's position and size straight into its transform XML
+
+    Equivalent to setting shape.left/top/width/height, but the xfrm, off
+    and ext elements are located (or created) once and the attributes are
+    written directly instead of through four python-pptx setters.
+
+    Args:
+        shape_element: Shape XML element (p:sp, p:pic, p:grpSp, p:graphicFrame, ...)
+        x, y: Offset in EMUs
+        cx, cy: Extents in EMUs
+    """
+    # get_or_add_* keep the schema order when elements have to be created
+    # (placeholders often inherit their geometry and have no xfrm yet)
+    xfrm = shape_element.get_or_add_xfrm()
+
+    off = xfrm.get_or_add_off()
+    off.set('x', str(int(x)))
+    off.set('y', str(int(y)))
+
+    ext = xfrm.get_or_add_ext()
+    ext.set('cx', str(int(cx)))
+    ext.set('cy', str(int(cy)))
+
 def _flip_shape_in_place(shape) -> None:
     """
     Flip a shape horizontally without changing its position (for chart slides)
@@ -865,29 +1205,36 @@ def _flip_shape_in_place(shape) -> None:
     """
     try:
         # SKIP CHARTS - they should not be flipped at all
-        if shape.shape_type == MSO_SHAPE_TYPE.CHART:
-            logger.debug(f"Skipping chart - charts are not flipped on chart slides")
+        if shape.shape_type == _SHAPE_CHART:
+            logger.debug("Skipping chart - charts are not flipped on chart slides")
             return
 
         # Apply horizontal flip via XML
         shape_element = shape._element
-        spPr = shape_element.find('.//p:spPr', namespaces=NAMESPACES)
+        spPr = _xpath_first(_SPPR_XP, shape_element)
 
         if spPr is None:
-            logger.debug(f"No spPr element found for shape")
+            logger.debug("No spPr element found for shape")
             return
 
         # Find or create xfrm (transform) element
-        xfrm = spPr.find('.//a:xfrm', namespaces=NAMESPACES)
+        xfrm = spPr.find(_TAG_XFRM)
 
         if xfrm is None:
-            # Create xfrm element if it doesn't exist
-            xfrm = etree.SubElement(spPr, f"{{{NAMESPACES['a']}}}xfrm")
+            # Create xfrm element if it doesn't exist - it is the first child
+            # of spPr/grpSpPr in the schema, so insert rather than append
+            xfrm = etree.Element(_TAG_XFRM)
+            spPr.insert(0, xfrm)
+
+        # Already mirrored - leave the XML untouched
+        if xfrm.get('flipH') == '1':
+            logger.debug("Shape already flipped horizontally")
+            return
 
         # Set flipH attribute to 1 (true)
         xfrm.set('flipH', '1')
 
-        logger.debug(f"Applied horizontal flip to shape (kept in position)")
+        logger.debug("Applied horizontal flip to shape (kept in position)")
 
     except Exception as e:
         logger.warning(f"Could not flip shape in place: {str(e)}")
@@ -910,16 +1257,23 @@ def _flip_shape_horizontally(shape) -> None:
         shape: PowerPoint shape to flip
     """
     try:
+        # Work on the raw xfrm/@rot value (60000ths of a degree) - integer
+        # math, one element lookup instead of the rotation getter + setter
+        xfrm = shape._element.get_or_add_xfrm()
+
         # Get current rotation
-        current_rotation = shape.rotation
+        current_rot = int(xfrm.get('rot', '0')) % _ROT_FULL_TURN
 
         # Calculate mirrored rotation: 180° - current_rotation
-        new_rotation = (180 - current_rotation) % 360
+        new_rot = (_ROT_HALF_TURN - current_rot) % _ROT_FULL_TURN
 
-        # Set new rotation
-        shape.rotation = new_rotation
+        # Set new rotation (0 is the default - omitted, as python-pptx does)
+        if new_rot:
+            xfrm.set('rot', str(new_rot))
+        else:
+            xfrm.attrib.pop('rot', None)
 
-        logger.debug(f"Mirrored arrow rotation: {current_rotation}° → {new_rotation}°")
+        logger.debug("Mirrored arrow rotation: %s° → %s°", current_rot / 60000, new_rot / 60000)
 
     except Exception as e:
         logger.warning(f"Could not flip arrow rotation: {str(e)}")
@@ -942,37 +1296,48 @@ def _set_arabic_font(shape) -> None:
 
     font_name = Config.ARABIC_FONT
 
-    text_frame = shape.text_frame
+    # Template for missing <a:cs> elements - copied per run instead of rebuilt
+    cs_template = etree.Element(_TAG_CS, typeface=font_name)
 
-    for paragraph in text_frame.paragraphs:
-        for run in paragraph.runs:
+    txBody = shape.text_frame._txBody
+
+    # Nothing to do for frames without any runs (e.g. empty placeholders)
+    if not _FIRST_RUN_XP(txBody):
+        return
+
+    # Walk <a:p>/<a:r> directly (the same runs paragraph.runs yields) -
+    # no _Paragraph/_Run proxies are built per run
+    for p_element in txBody.iterchildren(_TAG_P):
+        for r_element in p_element.iterchildren(_TAG_R):
             try:
-                # Set font name
-                run.font.name = font_name
-
-                # Ensure font applies to complex scripts (Arabic, Hebrew, etc.)
-                # Access XML to set both Latin and Complex Script fonts
-                rPr = run._element.rPr
-                if rPr is not None:
-                    # Set Latin font
-                    latin_elem = rPr.find('.//a:latin', namespaces=NAMESPACES)
-                    if latin_elem is not None:
-                        latin_elem.set('typeface', font_name)
-                    else:
-                        # Create latin element
-                        latin_elem = etree.SubElement(rPr, f"{{{NAMESPACES['a']}}}latin")
-                        latin_elem.set('typeface', font_name)
-
-                    # Set Complex Script font (for Arabic)
-                    cs_elem = rPr.find('.//a:cs', namespaces=NAMESPACES)
-                    if cs_elem is not None:
-                        cs_elem.set('typeface', font_name)
-                    else:
-                        # Create cs element
-                        cs_elem = etree.SubElement(rPr, f"{{{NAMESPACES['a']}}}cs")
-                        cs_elem.set('typeface', font_name)
-
-                logger.debug(f"Set Arabic font: {font_name}")
+                # Set both Latin and Complex Script fonts directly in XML
+                # (Complex Script covers Arabic, Hebrew, etc.)
+                rPr = r_element.get_or_add_rPr()
+                latin_elem = rPr.find(_TAG_LATIN)
+                cs_elem = rPr.find(_TAG_CS)
+
+                # Already set (e.g. a second pass) - leave the XML untouched
+                if (latin_elem is not None and cs_elem is not None and
+                        latin_elem.get('typeface') == font_name and
+                        cs_elem.get('typeface') == font_name):
+                    continue
+
+                # Latin font - get_or_add keeps schema order within <a:rPr>
+                if latin_elem is None:
+                    latin_elem = rPr.get_or_add_latin()
+                latin_elem.set('typeface', font_name)
+
+                # Complex Script font (for Arabic)
+                if cs_elem is not None:
+                    cs_elem.set('typeface', font_name)
+                else:
+                    # <a:cs> sits after latin/ea and before these in the schema
+                    rPr.insert_element_before(
+                        copy.copy(cs_template),
+                        'a:sym', 'a:hlinkClick', 'a:hlinkMouseOver', 'a:rtl', 'a:extLst'
+                    )
+
+                logger.debug("Set Arabic font: %s", font_name)
 
             except Exception as e:
                 logger.warning(f"Could not set font for run: {str(e)}")
@@ -987,36 +1352,15 @@ def reverse_bullet_order(text_frame) -> None:
     Args:
         text_frame: PowerPoint text_frame object
     """
-    # Extract all paragraph data
-    paragraphs_data = []
-
-    for paragraph in text_frame.paragraphs:
-        paragraphs_data.append({
-            'text': paragraph.text,
-            'level': paragraph.level,
-            'font_name': paragraph.font.name if paragraph.font.name else None,
-            'font_size': paragraph.font.size,
-            'bold': paragraph.font.bold,
-            'italic': paragraph.font.italic
-        })
-
-    # Clear existing paragraphs
-    text_frame.clear()
-
-    # Re-add in reverse order
-    for data in reversed(paragraphs_data):
-        p = text_frame.add_paragraph()
-        p.text = data['text']
-        p.level = data['level']
-
-        if data['font_name']:
-            p.font.name = data['font_name']
-        if data['font_size']:
-            p.font.size = data['font_size']
-        if data['bold']:
-            p.font.bold = data['bold']
-        if data['italic']:
-            p.font.italic = data['italic']
+    # Reorder the existing <a:p> elements in place - every run, color and
+    # paragraph property python-pptx doesn't model is kept as-is.
+    # Paragraphs are the last children of txBody (after bodyPr/lstStyle),
+    # so re-appending them in reverse keeps the schema order.
+    txBody = text_frame._txBody
+    paragraphs = list(txBody.iterchildren(_TAG_P))
+
+    for p_element in reversed(paragraphs):
+        txBody.append(p_element)  # append() moves the element
 
     logger.info("Reversed bullet order")
 
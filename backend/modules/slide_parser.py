@@ -4,7 +4,7 @@ Extracts slide structure, text elements, and hierarchy from PowerPoint slides
 """
 from pptx import Presentation
 from pptx.enum.shapes import MSO_SHAPE_TYPE
-from typing import Dict, List, Any
+from typing import Dict, Any
 import sys
 import os
 
@@ -15,6 +15,15 @@ from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Shape type enum member bound once (compared against for every shape)
+_SHAPE_GROUP = MSO_SHAPE_TYPE.GROUP
+
+# Placeholder types that decide the element type on their own
+_PLACEHOLDER_ELEMENT_TYPES = {
+    1: "title",         # PP_PLACEHOLDER.TITLE
+    2: "bullet_group"   # PP_PLACEHOLDER.BODY
+}
+
 def extract_slide_structure(pptx_path: str, slide_index: int = 0) -> Dict[str, Any]:
     """
     Extract structure and content from a PowerPoint slide
@@ -47,7 +56,28 @@ def extract_slide_structure(pptx_path: str, slide_index: int = 0) -> Dict[str, A
     try:
         # Load presentation
         prs = Presentation(pptx_path)
+    except Exception as e:
+        logger.error(f"Error parsing slide: {str(e)}", exc_info=True)
+        raise
+
+    return extract_slide_structure_from_presentation(prs, slide_index)
+
+def extract_slide_structure_from_presentation(prs, slide_index: int = 0) -> Dict[str, Any]:
+    """
+    Extract structure and content from a slide of an already-loaded presentation
 
+    Callers that parse several slides of the same file should load the
+    Presentation once and call this per slide instead of having
+    extract_slide_structure re-open the package every time.
+
+    Args:
+        prs: python-pptx Presentation object
+        slide_index: Index of slide to extract (default: 0 = first slide)
+
+    Returns:
+        Slide structure dictionary (see extract_slide_structure)
+    """
+    try:
         # Check if slide index exists
         if slide_index >= len(prs.slides):
             raise ValueError(f"Slide index {slide_index} out of range. Total slides: {len(prs.slides)}")
@@ -63,93 +93,89 @@ def extract_slide_structure(pptx_path: str, slide_index: int = 0) -> Dict[str, A
         }
 
         # Extract elements from shapes (including nested groups)
-        element_counter = [0]  # Use list to allow modification in nested function
+        element_counter = 0
+
+        # Depth-first walk over the shape tree with an explicit stack instead of
+        # a recursive call per group. Children are pushed in reverse so shapes
+        # are still visited (and numbered) in document order.
+        stack = list(slide.shapes)
+        stack.reverse()
 
-        def extract_from_shape(shape, parent_id=""):
-            """Recursively extract text from shape (handles groups, tables, text)"""
-            from pptx.enum.shapes import MSO_SHAPE_TYPE
+        while stack:
+            shape = stack.pop()
 
-            # Handle GROUPED SHAPES - recurse into nested shapes
-            if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
-                for sub_idx, sub_shape in enumerate(shape.shapes):
-                    sub_id = f"{parent_id}_group{sub_idx}" if parent_id else f"group{sub_idx}"
-                    extract_from_shape(sub_shape, sub_id)
-                return
+            # Handle GROUPED SHAPES - descend into nested shapes
+            if shape.shape_type == _SHAPE_GROUP:
+                sub_shapes = list(shape.shapes)
+                sub_shapes.reverse()
+                stack.extend(sub_shapes)
+                continue
+
+            # PowerPoint shape id - read once, shared by every element this shape produces
+            pptx_shape_id = getattr(shape, 'shape_id', 0)
 
             # Handle TABLES
-            if hasattr(shape, 'has_table') and shape.has_table:
+            if getattr(shape, 'has_table', False):
+                position = None  # Read once, shared by every cell of the table
                 for row_idx, row in enumerate(shape.table.rows):
                     for col_idx, cell in enumerate(row.cells):
                         text = cell.text.strip()
                         if text:
-                            elem_id = f"table_{element_counter[0]}"
-                            element_counter[0] += 1
+                            if position is None:
+                                position = _shape_position(shape)
+                            elem_id = f"table_{element_counter}"
+                            element_counter += 1
                             structure["elements"].append({
                                 "element_id": elem_id,
                                 "type": "table_cell",
                                 "text": text,
-                                "shape_id": getattr(shape, 'shape_id', 0),
-                                "position": {
-                                    "left": shape.left if shape.left is not None else 0,
-                                    "top": shape.top if shape.top is not None else 0,
-                                    "width": shape.width if shape.width is not None else 0,
-                                    "height": shape.height if shape.height is not None else 0
-                                },
+                                "shape_id": pptx_shape_id,
+                                "position": position,
                                 "level": 0
                             })
-                return
+                continue
 
             # Handle TEXT FRAMES (regular text boxes)
             if not shape.has_text_frame:
-                return
+                continue
+
+            # Walk the paragraphs once - the type decision, bullets and
+            # plain text below are all derived from this single pass
+            paragraph_scan = _scan_paragraphs(shape.text_frame)
 
             # Determine element type (needs shape index)
-            element_type = _determine_element_type(shape, element_counter[0])
+            element_type = _determine_element_type(shape, element_counter, paragraph_scan)
 
             # Extract text content
             if element_type == "bullet_group":
-                bullets = _extract_bullets(shape)
+                bullets = paragraph_scan["bullets"]
                 if bullets:
                     # Only increment counter when actually adding element
-                    shape_id = f"shape_{element_counter[0]}"
-                    element_counter[0] += 1
+                    shape_id = f"shape_{element_counter}"
+                    element_counter += 1
                     structure["elements"].append({
                         "element_id": shape_id,
                         "type": element_type,
                         "bullets": bullets,
-                        "shape_id": getattr(shape, 'shape_id', 0),
-                        "position": {
-                            "left": shape.left if shape.left is not None else 0,
-                            "top": shape.top if shape.top is not None else 0,
-                            "width": shape.width if shape.width is not None else 0,
-                            "height": shape.height if shape.height is not None else 0
-                        }
+                        "shape_id": pptx_shape_id,
+                        "position": _shape_position(shape)
                     })
             else:
-                # Single text element
-                text = shape.text.strip()
+                # Single text element (same value as shape.text, without re-walking runs)
+                text = "\n".join(paragraph_scan["texts"]).strip()
                 if text:
                     # Only increment counter when actually adding element
-                    shape_id = f"shape_{element_counter[0]}"
-                    element_counter[0] += 1
+                    shape_id = f"shape_{element_counter}"
+                    element_counter += 1
                     structure["elements"].append({
                         "element_id": shape_id,
                         "type": element_type,
                         "text": text,
-                        "shape_id": getattr(shape, 'shape_id', 0),
-                        "position": {
-                            "left": shape.left if shape.left is not None else 0,
-                            "top": shape.top if shape.top is not None else 0,
-                            "width": shape.width if shape.width is not None else 0,
-                            "height": shape.height if shape.height is not None else 0
-                        },
+                        "shape_id": pptx_shape_id,
+                        "position": _shape_position(shape),
                         "level": 0
                     })
 
-        # Process all top-level shapes
-        for shape in slide.shapes:
-            extract_from_shape(shape)
-
         logger.info(f"Extracted {len(structure['elements'])} elements from slide")
         return structure
 
@@ -157,33 +183,93 @@ def extract_slide_structure(pptx_path: str, slide_index: int = 0) -> Dict[str, A
         logger.error(f"Error parsing slide: {str(e)}", exc_info=True)
         raise
 
-def _determine_element_type(shape, shape_idx: int) -> str:
+def _shape_position(shape) -> Dict[str, int]:
+    """
+    Build the position dictionary for a shape, reading each property once
+
+    Args:
+        shape: PowerPoint shape object
+
+    Returns:
+        {"left": ..., "top": ..., "width": ..., "height": ...} in EMUs
+        (missing values are reported as 0)
+    """
+    return {
+        "left": shape.left or 0,
+        "top": shape.top or 0,
+        "width": shape.width or 0,
+        "height": shape.height or 0
+    }
+
+def _scan_paragraphs(text_frame) -> Dict[str, Any]:
+    """
+    Walk a text frame's paragraphs once and collect everything the parser needs
+
+    Args:
+        text_frame: PowerPoint text frame
+
+    Returns:
+        Dictionary containing:
+        {
+            "texts": [...],         # raw text of every paragraph, in order
+            "bullets": [...],       # non-empty paragraphs as bullet dictionaries
+            "has_bullets": bool,    # any indented paragraph / multi-paragraph text
+            "paragraph_count": int
+        }
+    """
+    paragraphs = text_frame.paragraphs
+    multi_paragraph = len(paragraphs) > 1
+
+    texts = []
+    bullets = []
+    has_bullets = False
+
+    for para_idx, paragraph in enumerate(paragraphs):
+        raw_text = paragraph.text
+        level = paragraph.level
+        text = raw_text.strip()
+
+        texts.append(raw_text)
+        if level > 0 or (multi_paragraph and text):
+            has_bullets = True
+        if text:  # Only include non-empty paragraphs
+            bullets.append({
+                "text": text,
+                "level": level,
+                "index": para_idx
+            })
+
+    return {
+        "texts": texts,
+        "bullets": bullets,
+        "has_bullets": has_bullets,
+        "paragraph_count": len(paragraphs)
+    }
+
+def _determine_element_type(shape, shape_idx: int, paragraph_scan: Dict[str, Any] = None) -> str:
     """
     Determine the type of element (title, header, bullet_group, text_box)
 
     Args:
         shape: PowerPoint shape object
         shape_idx: Index of shape on slide
+        paragraph_scan: Result of _scan_paragraphs for the shape's text frame
+                        (scanned here if not supplied)
 
     Returns:
         Element type string
     """
-    # Check if it's a title placeholder
+    # Check if it's a title/body placeholder (single dict lookup)
     if shape.is_placeholder:
-        ph_type = shape.placeholder_format.type
-        if ph_type == 1:  # PP_PLACEHOLDER.TITLE
-            return "title"
-        elif ph_type == 2:  # PP_PLACEHOLDER.BODY
-            return "bullet_group"
+        element_type = _PLACEHOLDER_ELEMENT_TYPES.get(shape.placeholder_format.type)
+        if element_type is not None:
+            return element_type
 
     # Check if shape has bullets
     if shape.has_text_frame:
-        text_frame = shape.text_frame
-        has_bullets = any(
-            paragraph.level > 0 or (len(text_frame.paragraphs) > 1 and paragraph.text.strip())
-            for paragraph in text_frame.paragraphs
-        )
-        if has_bullets or len(text_frame.paragraphs) > 2:
+        if paragraph_scan is None:
+            paragraph_scan = _scan_paragraphs(shape.text_frame)
+        if paragraph_scan["has_bullets"] or paragraph_scan["paragraph_count"] > 2:
             return "bullet_group"
 
     # Check position to determine if it's a header (near top)
@@ -194,34 +280,6 @@ def _determine_element_type(shape, shape_idx: int) -> str:
     # Default to text_box
     return "text_box"
 
-def _extract_bullets(shape) -> List[Dict[str, Any]]:
-    """
-    Extract bullet points from a text frame
-
-    Args:
-        shape: PowerPoint shape with text_frame
-
-    Returns:
-        List of bullet dictionaries
-    """
-    bullets = []
-
-    if not shape.has_text_frame:
-        return bullets
-
-    text_frame = shape.text_frame
-
-    for para_idx, paragraph in enumerate(text_frame.paragraphs):
-        text = paragraph.text.strip()
-        if text:  # Only include non-empty paragraphs
-            bullets.append({
-                "text": text,
-                "level": paragraph.level,
-                "index": para_idx
-            })
-
-    return bullets
-
 def get_text_by_element_id(structure: Dict[str, Any], element_id: str) -> str:
     """
     Get text content by element ID
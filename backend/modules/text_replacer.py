@@ -3,7 +3,14 @@ Text Replacer Module
 Replaces original English text with translated Arabic text in PowerPoint slides
 """
 from pptx import Presentation
-from typing import Dict, List, Any
+from pptx.dml.color import RGBColor
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+from pptx.enum.text import PP_ALIGN
+from pptx.text.text import Font
+from lxml import etree
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+import copy
+import logging
 import sys
 import os
 
@@ -14,6 +21,150 @@ from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# XML namespaces for PowerPoint
+NAMESPACES = {
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main'
+}
+
+_TAG_PPR = f"{{{NAMESPACES['a']}}}pPr"
+_TAG_T = f"{{{NAMESPACES['a']}}}t"
+
+_SHAPE_GROUP = MSO_SHAPE_TYPE.GROUP
+
+# Common fonts that support Arabic (lowercase; matched as substrings of the font name)
+_ARABIC_FONTS_LC = frozenset({
+    'arial', 'calibri', 'times new roman', 'tahoma',
+    'simplified arabic', 'traditional arabic', 'arabic typesetting',
+    'sakkal majalla', 'dubai', 'segoe ui',
+})
+
+# Gray text colors converted to black for better Arabic readability
+# (RGBColor is a tuple, so membership is a plain hash lookup - no hex formatting)
+_GRAY_COLORS = frozenset(
+    RGBColor.from_string(hex_color)
+    for hex_color in ('CCCCCC', 'CCCECE', 'C0C0C0', 'CACACA', 'D3D3D3', 'BEBEBE')
+)
+_BLACK = RGBColor(0, 0, 0)
+
+# Paragraph data used for bullets beyond the original ones (shared - never mutate)
+_DEFAULT_PARA = {'level': 0, 'rPr': None, 'para_formatting': {}}
+
+def _iter_shape_elements(
+    shapes,
+    table_cell_counts: Optional[Dict[int, int]] = None
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (element_id, shape) for every text-bearing shape, including grouped shapes
+    (MUST match parser logic so the element ids line up)
+
+    Depth-first walk with an explicit stack; children are pushed in reverse so
+    shapes are numbered in document order, exactly like slide_parser. Being a
+    generator, the caller can stop walking once it has every id it needs.
+
+    Args:
+        shapes: Top-level shape collection of a slide
+        table_cell_counts: Optional text-cell count per table shape id, as already
+            found by the parser - tables listed here are not re-read cell by cell
+
+    Yields:
+        Element id ("shape_N" / "table_N") and its shape object
+    """
+    element_counter = 0
+
+    stack = list(shapes)
+    stack.reverse()
+
+    while stack:
+        shape = stack.pop()
+
+        # Handle GROUPED SHAPES - descend into nested shapes
+        if shape.shape_type == _SHAPE_GROUP:
+            sub_shapes = list(shape.shapes)
+            sub_shapes.reverse()
+            stack.extend(sub_shapes)
+            continue
+
+        # Handle TABLES - one entry per cell with text (matches parser logic)
+        if getattr(shape, 'has_table', False):
+            cell_count = table_cell_counts.get(shape.shape_id) if table_cell_counts else None
+            if cell_count is not None:
+                for _ in range(cell_count):
+                    yield f"table_{element_counter}", shape
+                    element_counter += 1
+                continue
+
+            for row in shape.table.rows:
+                for cell in row.cells:
+                    if _has_visible_text(cell._tc):
+                        yield f"table_{element_counter}", shape  # Same shape once per cell
+                        element_counter += 1
+            continue
+
+        # Handle TEXT FRAMES - only count if has text
+        if not shape.has_text_frame:
+            continue
+
+        if not _has_visible_text(shape.text_frame._txBody):
+            continue  # Empty text, skip
+
+        # Shape has text
+        yield f"shape_{element_counter}", shape
+        element_counter += 1
+
+def _has_visible_text(element) -> bool:
+    """
+    Check whether an XML subtree has any non-whitespace text
+    Same answer as bool(shape.text.strip()), but stops at the first <a:t> with
+    visible text instead of joining and stripping the whole text
+
+    Args:
+        element: lxml element (text body or table cell)
+
+    Returns:
+        True if any <a:t> below the element contains non-whitespace text
+    """
+    for t in element.iter(_TAG_T):
+        text = t.text
+        if text and not text.isspace():
+            return True
+    return False
+
+def _map_elements_by_shape_id(shapes, elements: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Map element_id -> shape using the PowerPoint shape id the parser stored per element
+
+    Only walks the shape tree (no text is read), and is unaffected by shapes that were
+    moved into groups after parsing. Returns None when any element cannot be resolved
+    to exactly one shape, so the caller can fall back to _iter_shape_elements.
+
+    Args:
+        shapes: Top-level shape collection of a slide
+        elements: Elements from the slide structure
+
+    Returns:
+        Dictionary mapping element ids to shape objects, or None
+    """
+    shapes_by_id = {}
+
+    stack = list(shapes)
+    while stack:
+        shape = stack.pop()
+        if shape.shape_type == _SHAPE_GROUP:
+            stack.extend(shape.shapes)
+            continue
+        shape_id = shape.shape_id
+        # Duplicate ids (seen in hand-edited decks) make the id ambiguous
+        shapes_by_id[shape_id] = None if shape_id in shapes_by_id else shape
+
+    shape_map = {}
+    for element in elements:
+        shape = shapes_by_id.get(element.get("shape_id"))
+        if shape is None:
+            return None
+        shape_map[element["element_id"]] = shape
+
+    return shape_map
+
 def replace_text_in_slide(
     pptx_path: str,
     translations: Dict[str, Any],
@@ -31,89 +182,30 @@ def replace_text_in_slide(
         output_path: Path to save final output
         slide_index: Index of slide to process (default: 0)
     """
+    replace_text_in_deck(pptx_path, [(slide_index, translations, slide_structure)], output_path)
+
+def replace_text_in_deck(
+    pptx_path: str,
+    slides: List[Tuple[int, Dict[str, Any], Dict[str, Any]]],
+    output_path: str
+) -> None:
+    """
+    Replace original text with translated text in several slides of one presentation
+    Loads and saves the file once, instead of once per slide
+
+    Args:
+        pptx_path: Path to PowerPoint file (already RTL-converted)
+        slides: List of (slide_index, translations, slide_structure) tuples
+        output_path: Path to save final output
+    """
     logger.info(f"Replacing text with translations: {pptx_path}")
 
     try:
         # Load presentation
         prs = Presentation(pptx_path)
 
-        # Get target slide
-        if slide_index >= len(prs.slides):
-            raise ValueError(f"Slide index {slide_index} out of range")
-
-        slide = prs.slides[slide_index]
-
-        # Create a mapping of element_id to shape object for quick lookup
-        # Must handle grouped shapes recursively (same as parser logic)
-        shape_map = {}
-        element_counter = [0]
-
-        def map_shapes_recursive(shape, parent_id=""):
-            """Recursively map shapes including groups (MUST match parser logic)"""
-            from pptx.enum.shapes import MSO_SHAPE_TYPE
-
-            # Handle GROUPED SHAPES - recurse into nested shapes
-            if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
-                for sub_idx, sub_shape in enumerate(shape.shapes):
-                    sub_id = f"{parent_id}_group{sub_idx}" if parent_id else f"group{sub_idx}"
-                    map_shapes_recursive(sub_shape, sub_id)
-                return
-
-            # Handle TABLES - one entry per cell with text (matches parser logic)
-            if hasattr(shape, 'has_table') and shape.has_table:
-                has_text_cells = False
-                for row in shape.table.rows:
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            shape_id = f"table_{element_counter[0]}"
-                            element_counter[0] += 1
-                            shape_map[shape_id] = shape  # Map same shape multiple times (one per cell)
-                            has_text_cells = True
-                if has_text_cells:
-                    return  # Table handled
-                return  # No text in table, skip
-
-            # Handle TEXT FRAMES - only count if has text
-            if not shape.has_text_frame:
-                return  # No text frame, skip
-
-            text = shape.text.strip()
-            if not text:
-                return  # Empty text, skip
-
-            # Shape has text - add to map
-            shape_id = f"shape_{element_counter[0]}"
-            element_counter[0] += 1
-            shape_map[shape_id] = shape
-
-        # Build shape map from all top-level shapes
-        for shape in slide.shapes:
-            map_shapes_recursive(shape)
-
-        # Replace text for each element
-        for element in slide_structure["elements"]:
-            element_id = element["element_id"]
-
-            if element_id not in translations:
-                logger.warning(f"No translation found for element: {element_id}")
-                continue
-
-            if element_id not in shape_map:
-                logger.warning(f"Shape not found for element: {element_id}")
-                continue
-
-            shape = shape_map[element_id]
-
-            # Get translation
-            translation = translations[element_id]
-
-            # Replace based on element type
-            if isinstance(translation, list):
-                # Bullet group - replace each bullet
-                _replace_bullets(shape, translation)
-            else:
-                # Single text element
-                _replace_single_text(shape, translation)
+        for slide_index, translations, slide_structure in slides:
+            replace_text_in_presentation(prs, translations, slide_structure, slide_index)
 
         # Save final presentation
         prs.save(output_path)
@@ -123,6 +215,74 @@ def replace_text_in_slide(
         logger.error(f"Error during text replacement: {str(e)}", exc_info=True)
         raise
 
+def replace_text_in_presentation(
+    prs,
+    translations: Dict[str, Any],
+    slide_structure: Dict[str, Any],
+    slide_index: int = 0
+) -> None:
+    """
+    Replace original text with translated text in one slide of an open Presentation
+
+    Args:
+        prs: Loaded python-pptx Presentation (modified in place)
+        translations: Dictionary of translations from llm_translator
+        slide_structure: Slide structure from slide_parser
+        slide_index: Index of slide to process (default: 0)
+    """
+    # Get target slide
+    if slide_index >= len(prs.slides):
+        raise ValueError(f"Slide index {slide_index} out of range")
+
+    slide = prs.slides[slide_index]
+
+    # Create a mapping of element_id to shape object for quick lookup - resolved
+    # through the parser's PowerPoint shape ids when they are all usable, else by
+    # re-walking the slide with the parser's numbering
+    shape_map = _map_elements_by_shape_id(slide.shapes, slide_structure["elements"])
+    if shape_map is None:
+        table_cell_counts = {}
+        for element in slide_structure["elements"]:
+            if element.get("type") == "table_cell" and "shape_id" in element:
+                table_cell_counts[element["shape_id"]] = table_cell_counts.get(element["shape_id"], 0) + 1
+
+        # Only elements that have a translation are looked up - stop walking
+        # as soon as the last of them has been found
+        needed = {
+            element["element_id"] for element in slide_structure["elements"]
+            if element["element_id"] in translations
+        }
+        shape_map = {}
+        if needed:
+            for element_id, shape in _iter_shape_elements(slide.shapes, table_cell_counts):
+                if element_id in needed:
+                    shape_map[element_id] = shape
+                    if len(shape_map) == len(needed):
+                        break
+
+    # Replace text for each element
+    for element in slide_structure["elements"]:
+        element_id = element["element_id"]
+
+        # One lookup per dict (translations are strings or lists, never None)
+        translation = translations.get(element_id)
+        if translation is None:
+            logger.warning(f"No translation found for element: {element_id}")
+            continue
+
+        shape = shape_map.get(element_id)
+        if shape is None:
+            logger.warning(f"Shape not found for element: {element_id}")
+            continue
+
+        # Replace based on element type
+        if type(translation) is list:
+            # Bullet group - replace each bullet
+            _replace_bullets(shape, translation)
+        else:
+            # Single text element
+            _replace_single_text(shape, translation)
+
 def _replace_single_text(shape, translation: str) -> None:
     """
     Replace text in a single text element (title, header, text_box)
@@ -166,60 +326,12 @@ def _replace_single_text(shape, translation: str) -> None:
                     'color': first_run.font.color.rgb if first_run.font.color and hasattr(first_run.font.color, 'rgb') else None
                 }
 
-        # PRESERVE original margins, word wrap, and auto-size (DON'T add margins to circles!)
-        try:
-            original_margin_left = text_frame.margin_left
-        except:
-            original_margin_left = None
-        try:
-            original_margin_right = text_frame.margin_right
-        except:
-            original_margin_right = None
-        try:
-            original_margin_top = text_frame.margin_top
-        except:
-            original_margin_top = None
-        try:
-            original_margin_bottom = text_frame.margin_bottom
-        except:
-            original_margin_bottom = None
-
-        original_word_wrap = text_frame.word_wrap
-        original_auto_size = text_frame.auto_size
-
-        # PRESERVE VERTICAL ALIGNMENT (text anchor) - CRITICAL for "Cost Breakdown" positioning!
-        try:
-            original_vertical_anchor = text_frame.vertical_anchor
-        except:
-            original_vertical_anchor = None
-
-        # Clear text (keeps first empty paragraph to reuse)
+        # Clear text (keeps first empty paragraph to reuse) - <a:bodyPr> is untouched,
+        # so margins, word wrap and vertical anchor survive as they were
         text_frame.clear()
 
-        # RESTORE original settings - DON'T add defaults if they were unset
-        # This is CRITICAL for circles that have no margins!
-        if original_word_wrap is not None:
-            text_frame.word_wrap = original_word_wrap
-
-        if original_auto_size is not None:
-            text_frame.auto_size = original_auto_size
-
-        # RESTORE VERTICAL ALIGNMENT - prevents text from shifting down!
-        if original_vertical_anchor is not None:
-            text_frame.vertical_anchor = original_vertical_anchor
-
-        # RESTORE original margins with SLIGHT ADJUSTMENT for Arabic text positioning
         # Arabic text renders slightly lower due to different font metrics, so we reduce top margin
-        if original_margin_left is not None:
-            text_frame.margin_left = original_margin_left
-        if original_margin_right is not None:
-            text_frame.margin_right = original_margin_right
-        if original_margin_top is not None:
-            # Reduce top margin by ~15% to shift Arabic text upward
-            adjusted_margin_top = int(original_margin_top * 0.85) if original_margin_top > 0 else original_margin_top
-            text_frame.margin_top = adjusted_margin_top
-        if original_margin_bottom is not None:
-            text_frame.margin_bottom = original_margin_bottom
+        _reset_body_properties(text_frame, top_margin_scale=0.85)
 
         # Use existing first paragraph (clear() leaves one empty paragraph)
         # DON'T add new paragraph to avoid extra empty paragraph!
@@ -230,7 +342,6 @@ def _replace_single_text(shape, translation: str) -> None:
         run.text = translation
 
         # PRESERVE original alignment OR default to RIGHT for RTL
-        from pptx.enum.text import PP_ALIGN
         if original_para_formatting.get('alignment') is not None:
             # Keep original alignment (e.g., CENTER for numbers in circles!)
             paragraph.alignment = original_para_formatting['alignment']
@@ -250,49 +361,46 @@ def _replace_single_text(shape, translation: str) -> None:
             if original_para_formatting.get('space_after') is not None:
                 paragraph.space_after = original_para_formatting['space_after']
 
-        # Restore run-level formatting
+        # Restore run-level formatting (every key is captured together, so one
+        # emptiness check covers the whole block)
         if original_formatting:
-            run = paragraph.runs[0]
-            if original_formatting.get('bold') is not None:
-                run.font.bold = original_formatting['bold']
-            if original_formatting.get('italic') is not None:
-                run.font.italic = original_formatting['italic']
-            if original_formatting.get('underline') is not None:
-                run.font.underline = original_formatting['underline']
-
-            # Font name: Use Arial (classic standard Arabic font)
-            if original_formatting.get('font_name'):
-                font_name = original_formatting['font_name']
-                # Common fonts that support Arabic
-                arabic_fonts = ['Arial', 'Calibri', 'Times New Roman', 'Tahoma',
-                               'Simplified Arabic', 'Traditional Arabic', 'Arabic Typesetting',
-                               'Sakkal Majalla', 'Dubai', 'Segoe UI']
-                # If original font doesn't support Arabic, use Arial
-                if not any(af.lower() in font_name.lower() for af in arabic_fonts):
-                    font_name = 'Arial'
-                    logger.debug(f"Font {original_formatting['font_name']} doesn't support Arabic, using Arial")
-                else:
-                    # Even if it supports Arabic, prefer Arial for classic appearance
-                    font_name = 'Arial'
-                run.font.name = font_name
+            bold = original_formatting['bold']
+            italic = original_formatting['italic']
+            underline = original_formatting['underline']
+            font_name = original_formatting['font_name']
+            font_size = original_formatting['font_size']
+            color = original_formatting['color']
+
+            if bold is not None:
+                run.font.bold = bold
+            if italic is not None:
+                run.font.italic = italic
+            if underline is not None:
+                run.font.underline = underline
+
+            # Font name: Use Arial (classic standard Arabic font) - even fonts that
+            # support Arabic are replaced, so the lookup only decides whether to log
+            if font_name:
+                if logger.isEnabledFor(logging.DEBUG):
+                    font_name_lc = font_name.lower()
+                    if not any(af in font_name_lc for af in _ARABIC_FONTS_LC):
+                        logger.debug("Font %s doesn't support Arabic, using Arial", font_name)
+                run.font.name = 'Arial'
 
             # Font size: Reduce by 10% for Arabic (better fitting)
-            if original_formatting.get('font_size'):
-                original_size = original_formatting['font_size']
-                run.font.size = int(original_size * 0.9)
-            if original_formatting.get('color'):
+            if font_size:
+                run.font.size = int(font_size * 0.9)
+            if color:
                 # FIX: Convert gray colors to black for better Arabic readability
-                color = original_formatting['color']
                 # Check if color is gray (common gray values)
-                gray_colors = ['CCCCCC', 'CCCECE', 'C0C0C0', 'CACACA', 'D3D3D3', 'BEBEBE']
-                if str(color).upper() in gray_colors:
-                    from pptx.dml.color import RGBColor
-                    run.font.color.rgb = RGBColor(0, 0, 0)  # Black
-                    logger.debug(f"Converted gray color {color} to black for Arabic text")
+                if color in _GRAY_COLORS:
+                    run.font.color.rgb = _BLACK
+                    logger.debug("Converted gray color %s to black for Arabic text", color)
                 else:
-                    run.font.color.rgb = original_formatting['color']
+                    run.font.color.rgb = color
 
-        logger.debug(f"Replaced single text: '{translation[:50]}...' (formatting preserved)")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Replaced single text: '%s...' (formatting preserved)", translation[:50])
 
     except Exception as e:
         logger.warning(f"Could not replace single text: {str(e)}")
@@ -313,161 +421,155 @@ def _replace_bullets(shape, translations: List[str]) -> None:
     try:
         text_frame = shape.text_frame
 
+        # One translation per existing paragraph - rewrite the runs in place and keep
+        # each paragraph's own properties instead of clearing and rebuilding the frame
+        paragraphs = text_frame.paragraphs
+        if len(paragraphs) == len(translations) and all(p.text.strip() for p in paragraphs):
+            _replace_bullets_in_place(paragraphs, translations)
+            _reset_body_properties(text_frame)
+            logger.debug("Replaced %d bullets in place (formatting preserved)", len(translations))
+            return
+
         # Save original bullet levels AND formatting before clearing
         original_data = []
         for paragraph in text_frame.paragraphs:
             if paragraph.text.strip():
-                para_data = {
+                runs = paragraph.runs
+                original_data.append({
                     'level': paragraph.level,
-                    'formatting': {},
+                    # Run-level formatting: the first run's <a:rPr>, cloned onto the new run
+                    'rPr': runs[0]._r.rPr if runs else None,
                     'para_formatting': {
                         'alignment': paragraph.alignment,  # ✅ PRESERVE alignment
                         'line_spacing': paragraph.line_spacing,
                         'space_before': paragraph.space_before,
                         'space_after': paragraph.space_after,
                     }
-                }
-
-                # Save run-level formatting from first run
-                if paragraph.runs:
-                    first_run = paragraph.runs[0]
-                    para_data['formatting'] = {
-                        'bold': first_run.font.bold,
-                        'italic': first_run.font.italic,
-                        'underline': first_run.font.underline,
-                        'font_name': first_run.font.name,
-                        'font_size': first_run.font.size,
-                        'color': first_run.font.color.rgb if first_run.font.color and hasattr(first_run.font.color, 'rgb') else None
-                    }
+                })
 
-                original_data.append(para_data)
-
-        # Ensure we have enough data (pad with defaults if needed)
-        while len(original_data) < len(translations):
-            original_data.append({'level': 0, 'formatting': {}, 'para_formatting': {}})
-
-        # PRESERVE original margins, word wrap, and auto-size (same as single text)
-        try:
-            original_margin_left = text_frame.margin_left
-        except:
-            original_margin_left = None
-        try:
-            original_margin_right = text_frame.margin_right
-        except:
-            original_margin_right = None
-        try:
-            original_margin_top = text_frame.margin_top
-        except:
-            original_margin_top = None
-        try:
-            original_margin_bottom = text_frame.margin_bottom
-        except:
-            original_margin_bottom = None
-
-        original_word_wrap = text_frame.word_wrap
-        original_auto_size = text_frame.auto_size
-
-        # Clear existing content
+        # Clear existing content (margins and word wrap live on <a:bodyPr>, which is kept)
         text_frame.clear()
+        _reset_body_properties(text_frame)
 
-        # RESTORE original settings - DON'T add defaults if they were unset
-        if original_word_wrap is not None:
-            text_frame.word_wrap = original_word_wrap
-
-        if original_auto_size is not None:
-            text_frame.auto_size = original_auto_size
-
-        # RESTORE original margins EXACTLY
-        if original_margin_left is not None:
-            text_frame.margin_left = original_margin_left
-        if original_margin_right is not None:
-            text_frame.margin_right = original_margin_right
-        if original_margin_top is not None:
-            text_frame.margin_top = original_margin_top
-        if original_margin_bottom is not None:
-            text_frame.margin_bottom = original_margin_bottom
-
-        # Add translated bullets with original hierarchy and formatting
+        # Add translated bullets with original hierarchy and formatting - built directly
+        # on the <a:txBody> elements, without a Paragraph/Run wrapper per bullet
+        txBody = text_frame._txBody
         for i, translation_text in enumerate(translations):
-            paragraph = text_frame.add_paragraph()
+            # Extra translations (more than original bullets) fall back to defaults
+            data = original_data[i] if i < len(original_data) else _DEFAULT_PARA
+            para_fmt = data['para_formatting']
 
-            # Create run and set text (ensures we have a run to format)
-            run = paragraph.add_run()
-            run.text = translation_text
+            p = txBody.add_p()
+            pPr = p.get_or_add_pPr()
+            pPr.lvl = data['level']
 
-            paragraph.level = original_data[i]['level'] if i < len(original_data) else 0
-
-            # PRESERVE original alignment OR default to RIGHT for RTL
-            from pptx.enum.text import PP_ALIGN
-            if original_data[i]['para_formatting'].get('alignment') is not None:
-                # Keep original alignment
-                paragraph.alignment = original_data[i]['para_formatting']['alignment']
-            else:
-                # Default to RIGHT for RTL bullets
-                paragraph.alignment = PP_ALIGN.RIGHT
+            # PRESERVE original alignment OR default to RIGHT for RTL bullets
+            alignment = para_fmt.get('alignment')
+            pPr.algn = alignment if alignment is not None else PP_ALIGN.RIGHT
 
             # NOTE: We do NOT set rtl="1" because Arabic text from LLM is already
             # in correct logical order. Setting rtl="1" would reverse it again.
 
             # Restore paragraph-level formatting (alignment already set above)
-            if original_data[i]['para_formatting']:
-                para_fmt = original_data[i]['para_formatting']
-                if para_fmt.get('line_spacing') is not None:
-                    paragraph.line_spacing = para_fmt['line_spacing']
-                if para_fmt.get('space_before') is not None:
-                    paragraph.space_before = para_fmt['space_before']
-                if para_fmt.get('space_after') is not None:
-                    paragraph.space_after = para_fmt['space_after']
-
-            # Restore run-level formatting
-            if original_data[i]['formatting']:
-                run = paragraph.runs[0]
-                fmt = original_data[i]['formatting']
-
-                if fmt.get('bold') is not None:
-                    run.font.bold = fmt['bold']
-                if fmt.get('italic') is not None:
-                    run.font.italic = fmt['italic']
-                if fmt.get('underline') is not None:
-                    run.font.underline = fmt['underline']
-
-                # Font name: Use Arial (classic standard Arabic font)
-                if fmt.get('font_name'):
-                    font_name = fmt['font_name']
-                    # Common fonts that support Arabic
-                    arabic_fonts = ['Arial', 'Calibri', 'Times New Roman', 'Tahoma',
-                                   'Simplified Arabic', 'Traditional Arabic', 'Arabic Typesetting',
-                                   'Sakkal Majalla', 'Dubai', 'Segoe UI']
-                    # If original font doesn't support Arabic, use Arial
-                    if not any(af.lower() in font_name.lower() for af in arabic_fonts):
-                        font_name = 'Arial'
-                        logger.debug(f"Font {fmt['font_name']} doesn't support Arabic, using Arial")
-                    else:
-                        # Even if it supports Arabic, prefer Arial for classic appearance
-                        font_name = 'Arial'
-                    run.font.name = font_name
-
-                # Font size: Reduce by 10% for Arabic (better fitting)
-                if fmt.get('font_size'):
-                    original_size = fmt['font_size']
-                    run.font.size = int(original_size * 0.9)
-                if fmt.get('color'):
-                    # FIX: Convert gray colors to black for better Arabic readability
-                    color = fmt['color']
-                    # Check if color is gray (common gray values)
-                    gray_colors = ['CCCCCC', 'CCCECE', 'C0C0C0', 'CACACA', 'D3D3D3', 'BEBEBE']
-                    if str(color).upper() in gray_colors:
-                        from pptx.dml.color import RGBColor
-                        run.font.color.rgb = RGBColor(0, 0, 0)  # Black
-                        logger.debug(f"Converted gray color {color} to black for Arabic text")
-                    else:
-                        run.font.color.rgb = fmt['color']
-
-        logger.debug(f"Replaced {len(translations)} bullets (formatting preserved)")
+            if para_fmt:
+                if para_fmt['line_spacing'] is not None:
+                    pPr.line_spacing = para_fmt['line_spacing']
+                if para_fmt['space_before'] is not None:
+                    pPr.space_before = para_fmt['space_before']
+                if para_fmt['space_after'] is not None:
+                    pPr.space_after = para_fmt['space_after']
+
+            # Create run and set text
+            r = p.add_r()
+            r.text = translation_text
+
+            # Restore run-level formatting - one element copy instead of a setter per
+            # attribute, then the same Arabic adjustments as the in-place path
+            rPr = data['rPr']
+            if rPr is not None:
+                rPr = copy.deepcopy(rPr)
+                r.insert(0, rPr)
+                _adapt_font_for_arabic(Font(rPr))
+
+        logger.debug("Replaced %d bullets (formatting preserved)", len(translations))
 
     except Exception as e:
         logger.warning(f"Could not replace bullets: {str(e)}")
 
+def _reset_body_properties(text_frame, top_margin_scale: float = 1.0) -> None:
+    """
+    Adjust a cleared text frame's <a:bodyPr> in one place
+    clear() leaves <a:bodyPr> alone, so only two things change here: the auto-fit
+    element is reset to a bare one of the same kind (drops the stale fontScale /
+    lnSpcReduction computed for the original text), and the top margin is scaled
+
+    Args:
+        text_frame: Text frame that was just cleared
+        top_margin_scale: Factor applied to a positive top margin (default: unchanged)
+    """
+    bodyPr = text_frame._txBody.bodyPr
+
+    autofit = bodyPr.eg_textAutoFit
+    if autofit is not None and (len(autofit) or autofit.attrib):
+        bodyPr.replace(autofit, bodyPr.makeelement(autofit.tag))
+
+    if top_margin_scale != 1.0:
+        margin_top = bodyPr.tIns  # Default inset when the attribute is absent
+        if margin_top > 0:
+            bodyPr.tIns = int(margin_top * top_margin_scale)
+
+def _replace_bullets_in_place(paragraphs, translations: List[str]) -> None:
+    """
+    Replace the text of existing bullet paragraphs without rebuilding them
+    Keeps each paragraph's <a:pPr> (level, bullets, indents, spacing) and copies the
+    first run's <a:rPr> onto the new runs, then applies the Arabic font adjustments
+
+    Args:
+        paragraphs: Paragraphs of the text frame (same count as translations)
+        translations: List of translated bullet texts
+    """
+    for paragraph, translation_text in zip(paragraphs, translations):
+        runs = paragraph.runs
+        rPr = runs[0]._r.rPr if runs else None
+
+        paragraph.text = translation_text
+
+        if rPr is not None:
+            for r in paragraph._p.r_lst:
+                r.insert(0, copy.deepcopy(rPr))
+
+        # PRESERVE original alignment OR default to RIGHT for RTL bullets
+        if paragraph.alignment is None:
+            paragraph.alignment = PP_ALIGN.RIGHT
+
+        if rPr is not None:
+            for run in paragraph.runs:
+                _adapt_font_for_arabic(run.font)
+
+def _adapt_font_for_arabic(font) -> None:
+    """
+    Apply the Arabic font adjustments to a run that kept its original formatting:
+    Arial font, 10% smaller size, gray colors converted to black
+
+    Args:
+        font: Font of the text run
+    """
+    if font.name:
+        if logger.isEnabledFor(logging.DEBUG):
+            font_name_lc = font.name.lower()
+            if not any(af in font_name_lc for af in _ARABIC_FONTS_LC):
+                logger.debug("Font %s doesn't support Arabic, using Arial", font.name)
+        font.name = 'Arial'
+
+    # Font size: Reduce by 10% for Arabic (better fitting)
+    if font.size:
+        font.size = int(font.size * 0.9)
+
+    color = font.color.rgb if font.color and hasattr(font.color, 'rgb') else None
+    if color in _GRAY_COLORS:
+        font.color.rgb = _BLACK
+        logger.debug("Converted gray color %s to black for Arabic text", color)
+
 def _set_paragraph_rtl(paragraph) -> None:
     """
     Set RTL property on paragraph via XML manipulation
@@ -479,22 +581,15 @@ def _set_paragraph_rtl(paragraph) -> None:
         paragraph: PowerPoint paragraph object
     """
     try:
-        from lxml import etree
-
-        # XML namespaces for PowerPoint
-        NAMESPACES = {
-            'a': 'http://schemas.openxmlformats.org/drawingml/2006/main'
-        }
-
         # Get paragraph XML element
         p_element = paragraph._element
 
-        # Get or create <a:pPr> (paragraph properties)
-        pPr = p_element.find('.//a:pPr', namespaces=NAMESPACES)
+        # Get or create <a:pPr> (paragraph properties) - always a direct child of <a:p>
+        pPr = p_element.find(_TAG_PPR)
 
         if pPr is None:
             # Create <a:pPr> if it doesn't exist
-            pPr = etree.Element(f"{{{NAMESPACES['a']}}}pPr")
+            pPr = etree.Element(_TAG_PPR)
             # Insert as first child
             p_element.insert(0, pPr)
 
@@ -2,14 +2,19 @@
 XML Quality Checker Module
 Deep inspection of PowerPoint XML to find and fix subtle issues
 """
+import hashlib
+import io
+import json
+import shelve
+import threading
 import zipfile
-import tempfile
-import shutil
 import os
 import sys
 import re
-from typing import Dict, List
-from xml.etree import ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from lxml import etree as ET
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -19,6 +24,56 @@ from modules.llm_translator import get_openai_client
 
 logger = setup_logger(__name__)
 
+# XML namespaces for PowerPoint
+NAMESPACES = {
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    'p': 'http://schemas.openxmlformats.org/presentationml/2006/main',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+}
+
+# Text bodies of shapes (p:txBody) and of table cells (a:txBody)
+_TXBODY_TAGS = (f"{{{NAMESPACES['p']}}}txBody", f"{{{NAMESPACES['a']}}}txBody")
+
+# Elements the slide checks stream over
+_TAG_T = f"{{{NAMESPACES['a']}}}t"
+_TAG_LATIN = f"{{{NAMESPACES['a']}}}latin"
+_TAG_PPR = f"{{{NAMESPACES['a']}}}pPr"
+_TAG_BODYPR = f"{{{NAMESPACES['a']}}}bodyPr"
+# Top-level shapes holding text - freed as a whole once they have been checked
+_SHAPE_TAGS = (f"{{{NAMESPACES['p']}}}sp", f"{{{NAMESPACES['p']}}}graphicFrame")
+_TRANS_TAGS = (_TAG_T, _TAG_LATIN, _TAG_PPR, _TAG_BODYPR) + _SHAPE_TAGS
+
+# The model is only consulted for high/critical issues or many minor ones
+_URGENT_SEVERITIES = frozenset(('high', 'critical'))
+_AI_MIN_MINOR_ISSUES = 20
+
+# Persistent AI recommendation cache (shelve is not safe for concurrent writers)
+_RECOMMENDATION_CACHE_PATH = str(Config.CACHE_FOLDER / "xml_recommendations")
+_RECOMMENDATION_CACHE_LOCK = threading.Lock()
+
+# Margin check thresholds (EMUs): optimal margins are 0.03 inches = 27432 EMUs,
+# anything above 1.5x that is flagged; lIns defaults to 0.1 inch when absent
+_OPTIMAL_MARGIN = 27432
+_MARGIN_LIMIT = _OPTIMAL_MARGIN * 3 // 2
+_DEFAULT_L_INS = 91440
+_MARGIN_FIX = f'Reduce margins to {_OPTIMAL_MARGIN} EMUs (0.03 inches)'
+
+# Auto-fit choices - always direct children of <a:bodyPr> in the schema
+_AUTOFIT_TAGS = frozenset((f"{{{NAMESPACES['a']}}}normAutofit", f"{{{NAMESPACES['a']}}}spAutoFit"))
+
+class Issue(NamedTuple):
+    """
+    One XML-level issue found in a translated slide
+
+    Kept as a tuple while slides are analyzed; deep_xml_review turns the
+    final list into plain dicts for its JSON-friendly result.
+    """
+    type: str
+    severity: str
+    slide: str
+    description: str
+    fix: str
+
 def deep_xml_review(original_path: str, translated_path: str) -> Dict:
     """
     Perform deep XML-level review of translated presentation
@@ -32,34 +87,26 @@ def deep_xml_review(original_path: str, translated_path: str) -> Dict:
     """
     logger.info("Starting deep XML quality check...")
 
-    # Extract both presentations
-    temp_dir = tempfile.mkdtemp()
-    orig_dir = os.path.join(temp_dir, 'original')
-    trans_dir = os.path.join(temp_dir, 'translated')
-
-    with zipfile.ZipFile(original_path, 'r') as zip_ref:
-        zip_ref.extractall(orig_dir)
-
-    with zipfile.ZipFile(translated_path, 'r') as zip_ref:
-        zip_ref.extractall(trans_dir)
+    # Read only the slide parts - media, fonts and themes are never touched
+    orig_slides = _read_slide_parts(original_path)
+    trans_slides = _read_slide_parts(translated_path)
 
     # Compare slide XMLs
     issues = []
 
-    # Find all slide XML files
-    orig_slides_dir = os.path.join(orig_dir, 'ppt', 'slides')
-    trans_slides_dir = os.path.join(trans_dir, 'ppt', 'slides')
-
-    if os.path.exists(orig_slides_dir) and os.path.exists(trans_slides_dir):
-        orig_slides = sorted([f for f in os.listdir(orig_slides_dir) if f.endswith('.xml')])
-        trans_slides = sorted([f for f in os.listdir(trans_slides_dir) if f.endswith('.xml')])
-
-        for slide_file in orig_slides:
-            if slide_file in trans_slides:
-                orig_xml_path = os.path.join(orig_slides_dir, slide_file)
-                trans_xml_path = os.path.join(trans_slides_dir, slide_file)
-
-                slide_issues = analyze_slide_xml(orig_xml_path, trans_xml_path, slide_file)
+    # Slides left byte-for-byte unchanged were not translated - nothing to review there
+    slide_pairs = [
+        (io.BytesIO(trans_slides[slide_file]), slide_file)
+        for slide_file in sorted(orig_slides)
+        if slide_file in trans_slides and trans_slides[slide_file] != orig_slides[slide_file]
+    ]
+
+    # Slides are independent - analyze them in parallel (lxml parses outside the GIL);
+    # map() keeps the results in slide order
+    if slide_pairs:
+        max_workers = min(len(slide_pairs), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for slide_issues in executor.map(lambda pair: analyze_slide_xml(*pair), slide_pairs):
                 issues.extend(slide_issues)
 
     # Use AI to analyze issues and provide recommendations
@@ -70,171 +117,182 @@ def deep_xml_review(original_path: str, translated_path: str) -> Dict:
         logger.info("No XML-level issues found")
         recommendations = []
 
-    # Cleanup
-    shutil.rmtree(temp_dir)
-
     return {
         'status': 'complete',
         'issues_found': len(issues),
-        'issues': issues,
+        'issues': [issue._asdict() for issue in issues],
         'recommendations': recommendations
     }
 
-def analyze_slide_xml(orig_path: str, trans_path: str, slide_name: str) -> List[Dict]:
+def _read_slide_parts(pptx_path: str) -> Dict[str, bytes]:
+    """
+    Read the slide XML parts (ppt/slides/slideN.xml) straight from a PPTX archive
+
+    Args:
+        pptx_path: Path to PPTX file
+
+    Returns:
+        Dictionary mapping slide file name (e.g. "slide1.xml") to its XML bytes
     """
-    Analyze a single slide's XML for issues
+    slides = {}
+    with zipfile.ZipFile(pptx_path, 'r') as zip_ref:
+        for name in zip_ref.namelist():
+            folder, _, file_name = name.rpartition('/')
+            if folder == 'ppt/slides' and file_name.endswith('.xml'):
+                slides[file_name] = zip_ref.read(name)
+    return slides
+
+def analyze_slide_xml(trans_path: str, slide_name: str) -> List[Issue]:
+    """
+    Analyze a single translated slide's XML for issues
+
+    The slide is streamed with iterparse: only <a:t>, <a:latin>, <a:pPr> and
+    <a:bodyPr> are looked at, each is checked as soon as it has been parsed and
+    then cleared. Each <p:sp> / <p:graphicFrame> is freed once it ends, so at most
+    one shape's subtree (plus the shape tree's skeleton) is held in memory.
 
     Args:
-        orig_path: Path to original slide XML
-        trans_path: Path to translated slide XML
+        trans_path: Path (or binary file object) of translated slide XML
         slide_name: Name of the slide file
 
     Returns:
         List of issues found
     """
-    issues = []
-
-    # Read XML content
-    with open(orig_path, 'r', encoding='utf-8') as f:
-        orig_xml = f.read()
+    # Issues are collected per check and concatenated in check order at the end
+    overflow_issues = []
+    alignment_issues = []
+    margin_issues = []
+    autofit_issues = []
 
-    with open(trans_path, 'r', encoding='utf-8') as f:
-        trans_xml = f.read()
+    trans_fonts = set()
 
-    # Parse XML
     try:
-        orig_tree = ET.fromstring(orig_xml)
-        trans_tree = ET.fromstring(trans_xml)
+        # All checks in one pass
+        body_wraps = {}  # txBody element -> wrap setting of its <a:bodyPr>
+        text_idx = 0
+
+        for _, elem in ET.iterparse(trans_path, events=('end',), tag=_TRANS_TAGS):
+            tag = elem.tag
+
+            if tag == _TAG_T:
+                # Check 1: Text overflow detection
+                text = elem.text or ""
+                if len(text) > 100:  # Long text might overflow
+                    # Check if parent has proper text fitting settings
+                    text_body = next(elem.iterancestors(_TXBODY_TAGS), None)
+                    if body_wraps.get(text_body) == 'none':
+                        overflow_issues.append(Issue(
+                            type='text_overflow_risk',
+                            severity='medium',
+                            slide=slide_name,
+                            description=f"Text element {text_idx+1} has no word wrap (length: {len(text)})",
+                            fix='Enable word wrap'
+                        ))
+                text_idx += 1
+
+            elif tag == _TAG_LATIN:
+                # Check 2 input: fonts used in the translated slide
+                font = elem.get('typeface')
+                if font:
+                    trans_fonts.add(font)
+
+            elif tag == _TAG_PPR:
+                # Check 3: RTL alignment
+                # Check if text is properly aligned to right
+                algn = elem.get('algn', 'l')
+                rtl = elem.get('rtl', '0')
+
+                # For Arabic, alignment should be 'r' (right), and rtl should be '0' to prevent reversal
+                if algn != 'r':
+                    alignment_issues.append(Issue(
+                        type='alignment_issue',
+                        severity='high',
+                        slide=slide_name,
+                        description=f"Text not aligned to right (algn={algn})",
+                        fix='Set algn="r" for RTL text'
+                    ))
+
+                if rtl == '1':
+                    alignment_issues.append(Issue(
+                        type='rtl_attribute_issue',
+                        severity='high',
+                        slide=slide_name,
+                        description='rtl="1" will reverse Arabic text incorrectly',
+                        fix='Remove rtl="1" attribute'
+                    ))
+
+            elif tag in _SHAPE_TAGS:
+                # Shape fully checked - its text bodies can no longer be looked up
+                body_wraps.clear()
+
+            else:  # <a:bodyPr>
+                # Remembered for check 1 - the paragraphs of this text body come after it
+                body_wraps[elem.getparent()] = elem.get('wrap', 'square')  # Schema default is square (wrapping)
+
+                # Check 4: Margin settings
+                # Get margin values (in EMUs) - only parsed when set explicitly
+                l_ins_attr = elem.get('lIns')
+                l_ins = _DEFAULT_L_INS if l_ins_attr is None else int(l_ins_attr)
+
+                if l_ins > _MARGIN_LIMIT:
+                    margin_issues.append(Issue(
+                        type='large_margins',
+                        severity='low',
+                        slide=slide_name,
+                        description=f"Left margin is {l_ins} EMUs (optimal: {_OPTIMAL_MARGIN})",
+                        fix=_MARGIN_FIX
+                    ))
+
+                # Check 5: Auto-size settings
+                if not any(child.tag in _AUTOFIT_TAGS for child in elem):
+                    autofit_issues.append(Issue(
+                        type='no_autofit',
+                        severity='medium',
+                        slide=slide_name,
+                        description='No auto-fit detected for text',
+                        fix='Add <a:normAutofit/> for text-to-fit-shape'
+                    ))
+
+            _release(elem)
+
     except ET.ParseError as e:
         logger.error(f"XML parse error in {slide_name}: {str(e)}")
-        return issues
-
-    # Define namespaces
-    namespaces = {
-        'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
-        'p': 'http://schemas.openxmlformats.org/presentationml/2006/main',
-        'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
-    }
+        return []
 
-    # Check 1: Text overflow detection
-    trans_text_elements = trans_tree.findall('.//a:t', namespaces)
-    for idx, text_elem in enumerate(trans_text_elements):
-        text = text_elem.text or ""
-        if len(text) > 100:  # Long text might overflow
-            # Check if parent has proper text fitting settings
-            parent = text_elem
-            text_body = None
-            for _ in range(10):  # Search up to 10 levels
-                parent = parent if hasattr(parent, 'getparent') else None
-                if parent is None:
-                    break
-                if parent.tag.endswith('txBody'):
-                    text_body = parent
-                    break
-
-            if text_body is not None:
-                # Check for auto-fit settings
-                bodypr = text_body.find('.//a:bodyPr', namespaces)
-                if bodypr is not None:
-                    wrap = bodypr.get('wrap', 'none')
-                    if wrap == 'none':
-                        issues.append({
-                            'type': 'text_overflow_risk',
-                            'severity': 'medium',
-                            'slide': slide_name,
-                            'description': f"Text element {idx+1} has no word wrap (length: {len(text)})",
-                            'fix': 'Enable word wrap'
-                        })
+    issues = overflow_issues
 
     # Check 2: Font consistency
-    orig_fonts = set()
-    trans_fonts = set()
-
-    for latin_elem in orig_tree.findall('.//a:latin', namespaces):
-        font = latin_elem.get('typeface')
-        if font:
-            orig_fonts.add(font)
-
-    for latin_elem in trans_tree.findall('.//a:latin', namespaces):
-        font = latin_elem.get('typeface')
-        if font:
-            trans_fonts.add(font)
-
     # Check if multiple fonts in translated (should be consistent Arial)
     if len(trans_fonts) > 2:  # Allow for 2 fonts (body + title)
-        issues.append({
-            'type': 'font_inconsistency',
-            'severity': 'low',
-            'slide': slide_name,
-            'description': f"Multiple fonts detected in translated slide: {trans_fonts}",
-            'fix': 'Standardize to Arial'
-        })
-
-    # Check 3: RTL alignment
-    # Check if text is properly aligned to right
-    algn_elements = trans_tree.findall('.//a:pPr', namespaces)
-    for para_pr in algn_elements:
-        algn = para_pr.get('algn', 'l')
-        rtl = para_pr.get('rtl', '0')
-
-        # For Arabic, alignment should be 'r' (right), and rtl should be '0' to prevent reversal
-        if algn != 'r':
-            issues.append({
-                'type': 'alignment_issue',
-                'severity': 'high',
-                'slide': slide_name,
-                'description': f"Text not aligned to right (algn={algn})",
-                'fix': 'Set algn="r" for RTL text'
-            })
-
-        if rtl == '1':
-            issues.append({
-                'type': 'rtl_attribute_issue',
-                'severity': 'high',
-                'slide': slide_name,
-                'description': 'rtl="1" will reverse Arabic text incorrectly',
-                'fix': 'Remove rtl="1" attribute'
-            })
-
-    # Check 4: Margin settings
-    bodypr_elements = trans_tree.findall('.//a:bodyPr', namespaces)
-    for bodypr in bodypr_elements:
-        # Get margin values (in EMUs)
-        l_ins = int(bodypr.get('lIns', '91440'))  # Default 0.1 inch
-        r_ins = int(bodypr.get('rIns', '91440'))
-        t_ins = int(bodypr.get('tIns', '45720'))
-        b_ins = int(bodypr.get('bIns', '45720'))
-
-        # Optimal margins are 0.03 inches = 27432 EMUs
-        optimal_margin = 27432
-
-        if l_ins > optimal_margin * 1.5:
-            issues.append({
-                'type': 'large_margins',
-                'severity': 'low',
-                'slide': slide_name,
-                'description': f"Left margin is {l_ins} EMUs (optimal: {optimal_margin})",
-                'fix': f'Reduce margins to {optimal_margin} EMUs (0.03 inches)'
-            })
-
-    # Check 5: Auto-size settings
-    for bodypr in bodypr_elements:
-        # Check for proper auto-size
-        has_normAutofit = bodypr.find('.//a:normAutofit', namespaces) is not None
-        has_spAutoFit = bodypr.find('.//a:spAutoFit', namespaces) is not None
-
-        if not has_normAutofit and not has_spAutoFit:
-            issues.append({
-                'type': 'no_autofit',
-                'severity': 'medium',
-                'slide': slide_name,
-                'description': 'No auto-fit detected for text',
-                'fix': 'Add <a:normAutofit/> for text-to-fit-shape'
-            })
+        issues.append(Issue(
+            type='font_inconsistency',
+            severity='low',
+            slide=slide_name,
+            description=f"Multiple fonts detected in translated slide: {trans_fonts}",
+            fix='Standardize to Arial'
+        ))
+
+    issues.extend(alignment_issues)
+    issues.extend(margin_issues)
+    issues.extend(autofit_issues)
 
     return issues
 
-def get_ai_recommendations(issues: List[Dict]) -> List[Dict]:
+def _release(elem) -> None:
+    """
+    Free an iterparse element once it has been checked: clear its content and drop
+    the already-processed siblings before it (its ancestors stay intact)
+
+    Args:
+        elem: Element from an 'end' event
+    """
+    elem.clear()
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
+
+def get_ai_recommendations(issues: List[Issue]) -> List[Dict]:
     """
     Use AI to analyze issues and provide actionable recommendations
 
@@ -247,22 +305,67 @@ def get_ai_recommendations(issues: List[Dict]) -> List[Dict]:
     if not issues:
         return []
 
-    logger.info("Getting AI recommendations...")
-
-    # Group issues by type
+    # Group issues by type - the model only needs the type, how often it
+    # occurs and one representative description
     issue_summary = {}
+    has_urgent = False
     for issue in issues:
-        issue_type = issue['type']
+        issue_type = issue.type
         if issue_type not in issue_summary:
-            issue_summary[issue_type] = []
-        issue_summary[issue_type].append(issue)
+            issue_summary[issue_type] = {'type': issue_type, 'count': 0, 'example': issue.description,
+                                         'severity': issue.severity, 'fix': issue.fix}
+        issue_summary[issue_type]['count'] += 1
+        has_urgent = has_urgent or issue.severity in _URGENT_SEVERITIES
+
+    # A few minor issues don't need a model round-trip - the checks' own fixes are the advice
+    if not has_urgent and len(issues) < _AI_MIN_MINOR_ISSUES:
+        logger.info("No high-severity issues - using built-in recommendations")
+        return [
+            {
+                'issue_type': item['type'],
+                'severity': item['severity'],
+                'action': item['fix'],
+                'priority': 5
+            }
+            for item in issue_summary.values()
+        ]
+
+    logger.info("Getting AI recommendations...")
 
-    # Create prompt
-    issue_text = "\n\n".join([
-        f"**{issue_type}** ({len(items)} occurrences):\n" +
-        "\n".join([f"  - {item['description']}" for item in items[:3]])  # Show max 3 examples
-        for issue_type, items in issue_summary.items()
-    ])
+    summary_key = tuple(
+        (item['type'], item['count'], item['example'])
+        for item in sorted(issue_summary.values(), key=lambda item: item['type'])
+    )
+
+    try:
+        recommendations = [dict(rec) for rec in _fetch_ai_recommendations(summary_key)]
+        logger.info(f"Received {len(recommendations)} AI recommendations")
+        return recommendations
+
+    except Exception as e:
+        logger.error(f"Error getting AI recommendations: {str(e)}")
+        return []
+
+@lru_cache(maxsize=32)
+def _fetch_ai_recommendations(summary_key: Tuple[Tuple[str, int, str], ...]) -> Tuple[Dict, ...]:
+    """
+    Ask the model for recommendations on a (type, count, example) issue summary
+
+    Cached on the summary so repeated reviews with the same issue
+    distribution skip the API call; failures raise and are not cached.
+    Answers are also kept on disk, keyed by the issue-type histogram, so
+    they survive restarts and are shared between decks.
+    """
+    cache_key = _recommendation_cache_key(summary_key)
+    cached = _load_cached_recommendations(cache_key)
+    if cached is not None:
+        logger.info("Using cached AI recommendations")
+        return tuple(cached)
+
+    issue_text = "\n".join(
+        f"- {issue_type} ({count} occurrences), e.g. {example}"
+        for issue_type, count, example in summary_key
+    )
 
     prompt = f"""You are a PowerPoint XML expert reviewing a translated Arabic RTL presentation.
 
@@ -295,32 +398,56 @@ Format as JSON:
   ]
 }}"""
 
-    try:
-        client = get_openai_client()
+    client = get_openai_client()
 
-        response = client.chat.completions.create(
-            model=Config.OPENAI_MODEL,
-            messages=[
-                {"role": "system", "content": "You are a PowerPoint XML expert specializing in professional Arabic RTL presentations."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.2,
-            response_format={"type": "json_object"}
-        )
+    response = client.chat.completions.create(
+        model=Config.OPENAI_MODEL,
+        messages=[
+            {"role": "system", "content": "You are a PowerPoint XML expert specializing in professional Arabic RTL presentations."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.2,
+        response_format={"type": "json_object"}
+    )
 
-        import json
-        result = json.loads(response.choices[0].message.content)
-        recommendations = result.get('recommendations', [])
+    result = json.loads(response.choices[0].message.content)
+    recommendations = result.get('recommendations', [])
 
-        # Sort by priority
-        recommendations.sort(key=lambda x: x.get('priority', 5))
+    # Sort by priority
+    recommendations.sort(key=lambda x: x.get('priority', 5))
 
-        logger.info(f"Received {len(recommendations)} AI recommendations")
-        return recommendations
+    _store_cached_recommendations(cache_key, recommendations)
+
+    return tuple(recommendations)
+
+def _recommendation_cache_key(summary_key: Tuple[Tuple[str, int, str], ...]) -> str:
+    """
+    Disk cache key: the model plus the issue-type histogram (examples left out)
+    """
+    histogram = sorted((issue_type, count) for issue_type, count, _ in summary_key)
+    payload = json.dumps([Config.OPENAI_MODEL, histogram])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def _load_cached_recommendations(cache_key: str) -> Optional[List[Dict]]:
+    """
+    Look up recommendations in the disk cache; a broken cache is treated as a miss
+    """
+    try:
+        with _RECOMMENDATION_CACHE_LOCK, shelve.open(_RECOMMENDATION_CACHE_PATH) as cache:
+            return cache.get(cache_key)
+    except Exception as e:
+        logger.warning(f"Could not read AI recommendation cache: {str(e)}")
+        return None
 
+def _store_cached_recommendations(cache_key: str, recommendations: List[Dict]) -> None:
+    """
+    Save recommendations to the disk cache; failures only cost a future API call
+    """
+    try:
+        with _RECOMMENDATION_CACHE_LOCK, shelve.open(_RECOMMENDATION_CACHE_PATH) as cache:
+            cache[cache_key] = recommendations
     except Exception as e:
-        logger.error(f"Error getting AI recommendations: {str(e)}")
-        return []
+        logger.warning(f"Could not write AI recommendation cache: {str(e)}")
 
 if __name__ == "__main__":
     # Test deep XML review
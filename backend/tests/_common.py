@@ -0,0 +1,15 @@
+"""
+Shared helpers for the check scripts
+"""
+import re
+from functools import lru_cache
+from pptx import Presentation
+
+# Arabic Unicode block (U+0600-U+06FF), scanned by the C regex engine
+_ARABIC_RE = re.compile('[\u0600-\u06FF]').search
+
+
+@lru_cache(maxsize=8)
+def load_presentation(pptx_path):
+    """Load a PPTX once per path - the check scripts only read from it"""
+    return Presentation(pptx_path)
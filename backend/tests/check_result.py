@@ -1,13 +1,13 @@
 """
 Check the translated slide for Arabic text and formatting
 """
-from pptx import Presentation
+from _common import _ARABIC_RE, load_presentation
 from pptx.enum.text import PP_ALIGN
 import json
 
 def check_slide(pptx_path):
     """Check the translated slide"""
-    prs = Presentation(pptx_path)
+    prs = load_presentation(pptx_path)
     slide = prs.slides[0]
 
     results = {
@@ -23,7 +23,7 @@ def check_slide(pptx_path):
             text = shape.text.strip()
             if text and shape.text_frame.paragraphs:
                 # Check if it's Arabic
-                has_arabic = any('\u0600' <= c <= '\u06FF' for c in text)
+                has_arabic = _ARABIC_RE(text) is not None
 
                 # Get formatting
                 para = shape.text_frame.paragraphs[0]
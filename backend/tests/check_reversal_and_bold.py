@@ -1,7 +1,7 @@
 """
 Check if Arabic text is reversed and if bold formatting is preserved
 """
-from pptx import Presentation
+from _common import _ARABIC_RE, load_presentation
 import zipfile
 from lxml import etree
 import json
@@ -16,13 +16,13 @@ def check_text_reversal(pptx_path):
         "bold_status": []
     }
 
-    prs = Presentation(pptx_path)
+    prs = load_presentation(pptx_path)
     slide = prs.slides[0]
 
     for idx, shape in enumerate(slide.shapes):
         if shape.has_text_frame and shape.text.strip():
             text = shape.text.strip()
-            has_arabic = any('\u0600' <= c <= '\u06FF' for c in text)
+            has_arabic = _ARABIC_RE(text) is not None
 
             if has_arabic:
                 # Get first and last characters to check reversal
@@ -64,7 +64,7 @@ def check_original_bold(pptx_path):
         "shapes_with_bold": []
     }
 
-    prs = Presentation(pptx_path)
+    prs = load_presentation(pptx_path)
     slide = prs.slides[0]
 
     for idx, shape in enumerate(slide.shapes):
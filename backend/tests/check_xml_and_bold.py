@@ -1,6 +1,7 @@
 """
 Check XML for text direction and bold formatting
 """
+from _common import _ARABIC_RE
 from pptx import Presentation
 import zipfile
 from lxml import etree
@@ -19,7 +20,7 @@ def check_file(pptx_path):
     for idx, shape in enumerate(slide.shapes):
         if shape.has_text_frame and shape.text.strip():
             text = shape.text.strip()
-            has_arabic = any('\u0600' <= c <= '\u06FF' for c in text)
+            has_arabic = _ARABIC_RE(text) is not None
 
             if has_arabic:
                 print(f"\nShape {idx} (Arabic):")
@@ -52,7 +53,7 @@ def check_file(pptx_path):
         for idx, t_elem in enumerate(text_runs[:3]):  # First 3
             text = t_elem.text
             if text:
-                has_arabic = any('\u0600' <= c <= '\u06FF' for c in text)
+                has_arabic = _ARABIC_RE(text) is not None
                 if has_arabic:
                     print(f"\nText run {idx}:")
                     print(f"  Text: {text[:50]}")
@@ -66,40 +66,18 @@ def create_sample_slide(output_path: str):
     bullet_frame = bullet_box.text_frame
     bullet_frame.word_wrap = True
 
-    # Bullet 1
-    p1 = bullet_frame.paragraphs[0]
-    p1.text = "Revenue growth projected at 15% annually through 2027"
-    p1.level = 0
-    p1.font.size = Pt(18)
-    p1.font.name = "Calibri"
-
-    # Bullet 2
-    p2 = bullet_frame.add_paragraph()
-    p2.text = "Market share expansion opportunities in UAE and Saudi Arabia"
-    p2.level = 0
-    p2.font.size = Pt(18)
-    p2.font.name = "Calibri"
-
-    # Sub-bullet 2.1
-    p2_1 = bullet_frame.add_paragraph()
-    p2_1.text = "Digital transformation initiatives driving adoption"
-    p2_1.level = 1
-    p2_1.font.size = Pt(16)
-    p2_1.font.name = "Calibri"
-
-    # Bullet 3
-    p3 = bullet_frame.add_paragraph()
-    p3.text = "Competitive landscape analysis reveals strategic positioning advantages"
-    p3.level = 0
-    p3.font.size = Pt(18)
-    p3.font.name = "Calibri"
-
-    # Bullet 4
-    p4 = bullet_frame.add_paragraph()
-    p4.text = "Recommended investment: $2.5M for market entry phase"
-    p4.level = 0
-    p4.font.size = Pt(18)
-    p4.font.name = "Calibri"
+    # Bullets: (text, level, font size) - sub-bullets are level 1
+    bullets = [
+        ("Revenue growth projected at 15% annually through 2027", 0, 18),
+        ("Market share expansion opportunities in UAE and Saudi Arabia", 0, 18),
+        ("Digital transformation initiatives driving adoption", 1, 16),
+        ("Competitive landscape analysis reveals strategic positioning advantages", 0, 18),
+        ("Recommended investment: $2.5M for market entry phase", 0, 18),
+    ]
+    for idx, (text, level, size) in enumerate(bullets):
+        # The text frame starts with one empty paragraph - use it for the first bullet
+        para = bullet_frame.paragraphs[0] if idx == 0 else bullet_frame.add_paragraph()
+        _set_paragraph(para, text, level, size)
 
     # Save presentation
     prs.save(output_path)
@@ -109,6 +87,14 @@ def create_sample_slide(output_path: str):
     print("- Header: Key findings from MENA region analysis")
     print("- 4 main bullet points + 1 sub-bullet")
 
+def _set_paragraph(para, text: str, level: int, size: int, font_name: str = "Calibri"):
+    """Fill one bullet paragraph: text, indent level and Calibri font size"""
+    para.text = text
+    para.level = level
+    font = para.font
+    font.size = Pt(size)
+    font.name = font_name
+
 if __name__ == "__main__":
     # Create sample slide
     output_file = os.path.join(
@@ -0,0 +1,61 @@
+"""
+Tests for text_replacer bullet replacement
+"""
+from pptx import Presentation
+from pptx.util import Inches
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.text_replacer import _replace_bullets
+
+_A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+
+
+def _bullet_shape(texts):
+    """Text box with one paragraph per text and a shrunk normAutofit, as PowerPoint leaves it"""
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    shape = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(2))
+    text_frame = shape.text_frame
+    text_frame.text = texts[0]
+    for text in texts[1:]:
+        text_frame.add_paragraph().text = text
+
+    bodyPr = text_frame._txBody.bodyPr
+    autofit = bodyPr.makeelement(f"{_A}normAutofit", fontScale="62500", lnSpcReduction="20000")
+    bodyPr.append(autofit)
+    return shape
+
+
+def test_in_place_replacement_resets_autofit():
+    """Same paragraph and translation count (in-place path) - the English fontScale is dropped"""
+    shape = _bullet_shape(["First bullet", "Second bullet"])
+
+    _replace_bullets(shape, ["البند الأول", "البند الثاني"])
+
+    assert [p.text for p in shape.text_frame.paragraphs] == ["البند الأول", "البند الثاني"]
+    autofit = shape.text_frame._txBody.bodyPr.find(f"{_A}normAutofit")
+    assert autofit is not None
+    assert dict(autofit.attrib) == {}
+
+
+def test_rebuild_replacement_resets_autofit():
+    """More translations than paragraphs (rebuild path) - same bodyPr as the in-place path"""
+    shape = _bullet_shape(["First bullet"])
+
+    _replace_bullets(shape, ["البند الأول", "البند الثاني"])
+
+    # clear() keeps one empty paragraph ahead of the rebuilt bullets
+    assert [p.text for p in shape.text_frame.paragraphs if p.text] == ["البند الأول", "البند الثاني"]
+    autofit = shape.text_frame._txBody.bodyPr.find(f"{_A}normAutofit")
+    assert autofit is not None
+    assert dict(autofit.attrib) == {}
+
+
+if __name__ == "__main__":
+    test_in_place_replacement_resets_autofit()
+    test_rebuild_replacement_resets_autofit()
+    print("✓ text_replacer bullet tests passed")
@@ -1,6 +1,7 @@
 """
 Quick verification script to check if the fixes worked
 """
+from _common import _ARABIC_RE
 from pptx import Presentation
 import sys
 
@@ -23,7 +24,7 @@ def verify_translation(pptx_path):
                 shape_count += 1
 
                 # Check if it's Arabic text (contains Arabic characters)
-                has_arabic = any('\u0600' <= c <= '\u06FF' for c in text)
+                has_arabic = _ARABIC_RE(text) is not None
 
                 # Get first run to check formatting
                 if shape.text_frame.paragraphs and shape.text_frame.paragraphs[0].runs:
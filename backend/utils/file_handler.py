@@ -3,7 +3,6 @@ File handling utilities
 """
 import os
 import uuid
-from pathlib import Path
 from typing import Tuple
 from werkzeug.utils import secure_filename
 from config import Config
@@ -11,6 +10,12 @@ from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Lowercase allowed suffixes, frozen once for O(1) membership checks
+_ALLOWED_EXTENSIONS = frozenset(extension.lower() for extension in Config.ALLOWED_EXTENSIONS)
+
+# Plain-string upload folder for building per-request paths without Path objects
+_UPLOAD_FOLDER = os.fspath(Config.UPLOAD_FOLDER)
+
 def is_allowed_file(filename: str) -> bool:
     """
     Check if file extension is allowed
@@ -21,7 +26,8 @@ def is_allowed_file(filename: str) -> bool:
     Returns:
         True if extension is allowed, False otherwise
     """
-    return Path(filename).suffix.lower() in Config.ALLOWED_EXTENSIONS
+    stem, _, extension = filename.rpartition('.')
+    return bool(stem) and f".{extension.lower()}" in _ALLOWED_EXTENSIONS
 
 def save_uploaded_file(file, filename: str) -> Tuple[str, str]:
     """
@@ -35,21 +41,21 @@ def save_uploaded_file(file, filename: str) -> Tuple[str, str]:
         Tuple of (file_id, file_path)
     """
     # Generate unique ID
-    file_id = str(uuid.uuid4())
+    file_id = uuid.uuid4().hex
 
     # Secure the filename
     secure_name = secure_filename(filename)
-    extension = Path(secure_name).suffix
+    extension = os.path.splitext(secure_name)[1]
 
     # Create new filename with UUID
     new_filename = f"{file_id}{extension}"
-    file_path = Config.UPLOAD_FOLDER / new_filename
+    file_path = os.path.join(_UPLOAD_FOLDER, new_filename)
 
     # Save file
-    file.save(str(file_path))
+    file.save(file_path)
     logger.info(f"Saved uploaded file: {new_filename}")
 
-    return file_id, str(file_path)
+    return file_id, file_path
 
 def get_output_path(file_id: str, suffix: str = "_translated") -> str:
     """
@@ -75,9 +81,14 @@ def cleanup_temp_files(file_id: str):
     """
     try:
         # Clean up upload file
+        # Unlink directly (no exists() check first): one syscall, and no race
+        # with another request removing the same file in between
         upload_file = Config.UPLOAD_FOLDER / f"{file_id}.pptx"
-        if upload_file.exists():
+        try:
             upload_file.unlink()
+        except FileNotFoundError:
+            pass
+        else:
             logger.info(f"Cleaned up upload file: {file_id}.pptx")
 
         # Clean up output file (optional, keep for download)
@@ -3,12 +3,23 @@ Logging utility for the application
 """
 import logging
 import sys
+from functools import lru_cache
 from config import Config
 
+# Resolved once - shared by every logger the application sets up
+_LOG_LEVEL = getattr(logging, Config.LOG_LEVEL)
+_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+@lru_cache(maxsize=None)
 def setup_logger(name: str) -> logging.Logger:
     """
     Set up logger with consistent formatting
 
+    Cached per name, so repeated calls return the already-configured logger.
+
     Args:
         name: Logger name (usually __name__)
 
@@ -18,21 +29,13 @@ def setup_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
 
     # Set level from config
-    logger.setLevel(getattr(logging, Config.LOG_LEVEL))
-
-    # Create console handler
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setLevel(getattr(logging, Config.LOG_LEVEL))
-
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    handler.setFormatter(formatter)
+    logger.setLevel(_LOG_LEVEL)
 
-    # Add handler to logger
+    # Add a console handler unless the logger already has one
     if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setLevel(_LOG_LEVEL)
+        handler.setFormatter(_FORMATTER)
         logger.addHandler(handler)
 
     return logger
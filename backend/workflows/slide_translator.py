@@ -9,11 +9,11 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from modules.slide_parser import extract_slide_structure
+from modules.slide_parser import extract_slide_structure_from_presentation
 from modules.context_builder import build_context_map
 from modules.llm_translator import translate_with_openai
-from modules.rtl_converter import flip_to_rtl_layout
-from modules.text_replacer import replace_text_in_slide
+from modules.rtl_converter import flip_presentation_to_rtl_layout
+from modules.text_replacer import replace_text_in_presentation
 from modules.layout_translator import translate_slide_layouts
 from config import Config
 from utils.logger import setup_logger
@@ -112,9 +112,11 @@ class SlideTranslatorWorkflow:
         self.state['current_step'] = 'parsing'
         logger.info("\n[STEP 1/7] Parsing slide structures...")
 
-        # Get slide count
+        # Load once - used for the slide count, for parsing every slide and
+        # (kept in the state) for the RTL conversion and text replacement
         from pptx import Presentation
         prs = Presentation(self.input_path)
+        self.state['presentation'] = prs
         self.state['slide_count'] = len(prs.slides)
 
         logger.info(f"Found {self.state['slide_count']} slides to translate")
@@ -122,7 +124,7 @@ class SlideTranslatorWorkflow:
         # Parse each slide
         for slide_idx in range(self.state['slide_count']):
             logger.info(f"\nParsing slide {slide_idx + 1}/{self.state['slide_count']}...")
-            slide_structure = extract_slide_structure(self.input_path, slide_idx)
+            slide_structure = extract_slide_structure_from_presentation(prs, slide_idx)
 
             element_count = len(slide_structure['elements'])
             logger.info(f"  ✓ Extracted {element_count} elements")
@@ -165,11 +167,9 @@ class SlideTranslatorWorkflow:
         self.state['current_step'] = 'rtl_conversion'
         logger.info("\n[STEP 4/7] Converting ALL slides to RTL layout...")
 
-        # Create temporary file for RTL conversion
-        rtl_temp_path = self.output_path.replace('.pptx', '_rtl_temp.pptx')
-        self.state['rtl_temp_path'] = rtl_temp_path
-
-        flip_to_rtl_layout(self.input_path, rtl_temp_path)
+        # Converted in memory on the presentation parsed in step 1 - no
+        # reload of the input and no RTL temp file
+        flip_presentation_to_rtl_layout(self.state['presentation'])
 
         logger.info(f"✓ RTL conversion complete for all slides")
 
@@ -178,23 +178,18 @@ class SlideTranslatorWorkflow:
         self.state['current_step'] = 'text_replacement'
         logger.info("\n[STEP 5/7] Replacing text with translations...")
 
-        # Start with RTL temp file
-        current_file = self.state['rtl_temp_path']
-
+        # Apply every slide's translations to the RTL-converted presentation, then save once
+        prs = self.state['presentation']
         for slide_idx, slide_data in enumerate(self.state['slides_data']):
-            logger.info(f"\nReplacing text in slide {slide_idx + 1}...")
-
-            # For the last slide, output to final path
-            output_file = self.output_path if slide_idx == len(self.state['slides_data']) - 1 else current_file
-
-            replace_text_in_slide(
-                current_file,
+            replace_text_in_presentation(
+                prs,
                 slide_data['translations'],
                 slide_data['structure'],
-                output_file,
                 slide_idx
             )
 
+        prs.save(self.output_path)
+
         logger.info(f"✓ Text replacement complete for all slides")
 
     def _step_6_translate_layouts(self):
@@ -207,11 +202,9 @@ class SlideTranslatorWorkflow:
 
         translate_slide_layouts(self.output_path, layout_output)
 
-        # Replace output with layout-translated version
-        import os
+        # Replace output with layout-translated version (atomic swap)
         if os.path.exists(layout_output):
-            os.remove(self.output_path)
-            os.rename(layout_output, self.output_path)
+            os.replace(layout_output, self.output_path)
 
         logger.info(f"✓ Layout backgrounds translated")
 
@@ -221,7 +214,7 @@ class SlideTranslatorWorkflow:
         logger.info("\nCleaning up temporary files...")
 
         # Remove RTL temp file
-        if self.state['rtl_temp_path'] and os.path.exists(self.state['rtl_temp_path']):
+        if self.state.get('rtl_temp_path') and os.path.exists(self.state['rtl_temp_path']):
             try:
                 os.remove(self.state['rtl_temp_path'])
                 logger.info(f"✓ Removed temp file: {self.state['rtl_temp_path']}")